@@ -2,26 +2,141 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import json
 import threading
-from typing import Dict, List, Any, Optional
+import queue
+import asyncio
+from typing import Dict, List, Any, Optional, Callable, Tuple, NamedTuple
 from node_editor_integration import NodeEditorIntegration
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from collections import OrderedDict
 import os
+import re
+import importlib.util
+import copy
+from operator import itemgetter
 
-# Try to import AI libraries
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+# Check for AI libraries without importing them; torch and transformers
+# take seconds to load, so they are only imported once a provider needs them
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+LOCAL_AI_AVAILABLE = (importlib.util.find_spec("transformers") is not None and
+                      importlib.util.find_spec("torch") is not None)
+BITSANDBYTES_AVAILABLE = importlib.util.find_spec("bitsandbytes") is not None
+FLASH_ATTENTION_AVAILABLE = importlib.util.find_spec("flash_attn") is not None
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# numpy/numba are imported by load_compute_dps on the first batch analysis
+np = None
+prange = range
+
+SYSTEM_PROMPT = """You are an AI assistant specializing in Command & Conquer Generals modding.
+You have deep knowledge of:
+- Unit balance and game mechanics
+- INI file structure and syntax
+- Weapon systems and damage calculations
+- The relationship between different game objects
+
+Provide helpful, specific advice for modding the game."""
+
+class Effectiveness(NamedTuple):
+    """Weapon effectiveness vs each target class"""
+    vehicles: str
+    infantry: str
+    buildings: str
+
+# Weapon effectiveness by damage type
+WEAPON_EFFECTIVENESS = {
+    'ARMOR_PIERCING': Effectiveness('High', 'Low', 'Medium'),
+    'SMALL_ARMS': Effectiveness('Low', 'High', 'Low'),
+    'EXPLOSION': Effectiveness('Medium', 'High', 'High'),
+    'FLAME': Effectiveness('Low', 'Very High', 'Medium'),
+}
+DEFAULT_EFFECTIVENESS = Effectiveness('Medium', 'Medium', 'Medium')
+
+# Weapon stats read by the analysis, with the value used when a weapon omits one
+WEAPON_DEFAULTS = {
+    'PrimaryDamage': 0.0,
+    'DelayBetweenShots': 1000.0,
+    'ClipSize': 0,
+    'ClipReloadTime': 0.0,
+    'AttackRange': 0.0,
+    'DamageType': 'NORMAL',
+}
+WEAPON_FIELDS = itemgetter(*WEAPON_DEFAULTS)
+
+# Weapon suggestion flags, combined as bits so a whole batch can be flagged at once
+LOW_DPS, HIGH_DPS, LONG_RANGE = 1, 2, 4
+WEAPON_SUGGESTION_TEXT = {
+    LOW_DPS: "Very low DPS - consider increasing damage or fire rate",
+    HIGH_DPS: "Very high DPS - may be overpowered",
+    LONG_RANGE: "Long range weapon - ensure it has drawbacks",
+}
+SUGGESTIONS_BY_FLAGS = [
+    [text for flag, text in WEAPON_SUGGESTION_TEXT.items() if flags & flag]
+    for flags in range(8)
+]
+
+def _compute_dps_loop(damage, fire_rate, clip_size, reload_time):
+    """DPS per weapon; fire_rate and reload_time are in seconds"""
+    n = damage.shape[0]
+    dps = np.empty(n, np.float64)
+    for i in prange(n):
+        if clip_size[i] > 0:
+            # Clip weapons include the reload
+            total_time = (clip_size[i] - 1) * fire_rate[i] + reload_time[i]
+            shot_damage = damage[i] * clip_size[i]
+        else:
+            # Continuous fire
+            total_time = fire_rate[i]
+            shot_damage = damage[i]
+        dps[i] = shot_damage / total_time if total_time > 0 else 0.0
+    return dps
+
+def _compute_dps_vectorized(damage, fire_rate, clip_size, reload_time):
+    """DPS per weapon; fire_rate and reload_time are in seconds"""
+    # Clip weapons include the reload, others fire continuously
+    has_clip = clip_size > 0
+    total_time = np.where(has_clip, (clip_size - 1) * fire_rate + reload_time, fire_rate)
+    shot_damage = np.where(has_clip, damage * clip_size, damage)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_time > 0, shot_damage / total_time, 0.0)
+
+compute_dps = None
+
+def load_compute_dps():
+    """Import numpy (and numba if installed) and build the DPS kernel once"""
+    global np, prange, compute_dps
+    if compute_dps is None:
+        import numpy as np
+        if NUMBA_AVAILABLE:
+            from numba import njit, prange
+            compute_dps = njit(parallel=True, fastmath=True, cache=True)(_compute_dps_loop)
+        else:
+            compute_dps = _compute_dps_vectorized
+    return compute_dps
+
+# Keywords the built-in fallback responds to, matched anywhere in the prompt
+FALLBACK_KEYWORDS = re.compile(
+    r"balance|create|counter|improve|optimize|unit|weapon", re.IGNORECASE
+)
+
+# Loaded local models shared by every assistant, so reopening the dialog or
+# applying settings doesn't reload the weights.
+# (model, quantization, compile, device) ->
+#     (tokenizer, model, compiled, system_ids, system_cache)
+LOCAL_MODEL_CACHE = {}
+LOCAL_MODEL_LOCK = threading.Lock()
+
+def local_model_key(config) -> Tuple[str, str, bool, str]:
+    """Key identifying a config's local model in LOCAL_MODEL_CACHE"""
     import torch
-    LOCAL_AI_AVAILABLE = True
-except ImportError:
-    LOCAL_AI_AVAILABLE = False
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return (config.local_model, config.quantization, config.compile_model, device)
+
+# Responses starting with these are failures and never cached
+ERROR_PREFIXES = ("Error generating response:", "OpenAI Error:", "Local Model Error:")
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AIConfig:
     """Configuration for AI services"""
     use_openai: bool = False
@@ -31,132 +146,441 @@ class AIConfig:
     local_model: str = "microsoft/phi-2"
     temperature: float = 0.7
     max_tokens: int = 1000
+    quantization: str = "int8"  # "int8", "fp16" or "fp32"
+    compile_model: bool = True  # torch.compile the decode step (CUDA only)
+    max_batch_size: int = 8  # Queued local requests generated together
 
 class AIAssistant:
     """AI Assistant for C&C Generals modding"""
     
+    RESPONSE_CACHE_SIZE = 64
+    # Seconds to wait for the next streamed token before giving up on generate()
+    STREAM_TIMEOUT = 300
+    
     def __init__(self, config: AIConfig = None):
         self.config = config or AIConfig()
-        self.local_pipeline = None
+        self.response_cache = OrderedDict()  # (prompt, context) -> response, LRU order
+        self.cache_lock = threading.Lock()
+        self.local_model = None
+        self.local_tokenizer = None
+        self.local_compiled = False
+        self.system_ids = None  # SYSTEM_PROMPT token ids
+        self.system_cache = None  # SYSTEM_PROMPT KV cache, copied into each generate
+        self.local_model_key = None
+        self.openai_client = None
+        self.openai_async_client = None
         
         # Initialize AI services
         if self.config.use_openai and OPENAI_AVAILABLE and self.config.openai_api_key:
-            openai.api_key = self.config.openai_api_key
+            import openai
+            
+            # One client per assistant so the HTTPS connection is reused
+            self.openai_client = openai.OpenAI(api_key=self.config.openai_api_key)
+            self.openai_async_client = openai.AsyncOpenAI(api_key=self.config.openai_api_key)
             
         if self.config.use_local and LOCAL_AI_AVAILABLE:
             try:
-                # Use a smaller model for faster responses
-                self.local_pipeline = pipeline(
-                    "text-generation",
-                    model=self.config.local_model,
-                    device="cuda" if torch.cuda.is_available() else "cpu"
-                )
+                self._init_local_model()
             except Exception as e:
                 print(f"Failed to load local model: {e}")
-                self.local_pipeline = None
+                self.local_model = None
+                self.local_tokenizer = None
                 
-    def generate_response(self, prompt: str, context: Dict = None) -> str:
-        """Generate a response using available AI service"""
+    def _init_local_model(self):
+        """Get the local model from the shared cache, loading it on first use"""
+        from transformers import AutoTokenizer
+        
+        key = local_model_key(self.config)
+        with LOCAL_MODEL_LOCK:
+            if key not in LOCAL_MODEL_CACHE:
+                # Use a smaller model for faster responses
+                self.local_tokenizer = AutoTokenizer.from_pretrained(self.config.local_model)
+                self.local_model = self._load_local_model()
+                self._compile_local_model()
+                self._prefill_system_prompt()
+                LOCAL_MODEL_CACHE[key] = (self.local_tokenizer, self.local_model,
+                                          self.local_compiled, self.system_ids,
+                                          self.system_cache)
+            (self.local_tokenizer, self.local_model, self.local_compiled,
+             self.system_ids, self.system_cache) = LOCAL_MODEL_CACHE[key]
+        self.local_model_key = key
+        
+    def unload(self):
+        """Drop this assistant's local model from the cache and free GPU memory"""
+        if self.local_model_key is None:
+            return
+            
+        import torch
+        
+        with LOCAL_MODEL_LOCK:
+            LOCAL_MODEL_CACHE.pop(self.local_model_key, None)
+        self.local_model = None
+        self.local_tokenizer = None
+        self.system_ids = None
+        self.system_cache = None
+        self.local_model_key = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            
+    def _load_local_model(self):
+        """Load the local model with the configured quantization"""
+        import torch
+        from transformers import AutoModelForCausalLM
+        
+        quantization = self.config.quantization
+        use_cuda = torch.cuda.is_available()
+        
+        # INT8 needs bitsandbytes and a GPU, FP16 is only worth it on GPU
+        if quantization == "int8" and not (use_cuda and BITSANDBYTES_AVAILABLE):
+            quantization = "fp16"
+        if quantization == "fp16" and not use_cuda:
+            quantization = "fp32"
+            
+        # Fused attention kernels; FlashAttention-2 only runs half precision on GPU
+        if use_cuda and quantization != "fp32" and FLASH_ATTENTION_AVAILABLE:
+            attn_implementation = "flash_attention_2"
+        else:
+            attn_implementation = "sdpa"
+            
+        if quantization == "int8":
+            return AutoModelForCausalLM.from_pretrained(
+                self.config.local_model,
+                load_in_8bit=True,
+                torch_dtype=torch.float16,
+                device_map="auto",
+                attn_implementation=attn_implementation
+            )
+        elif quantization == "fp16":
+            return AutoModelForCausalLM.from_pretrained(
+                self.config.local_model,
+                torch_dtype=torch.float16,
+                device_map="auto",
+                attn_implementation=attn_implementation
+            )
+        else:
+            return AutoModelForCausalLM.from_pretrained(
+                self.config.local_model,
+                torch_dtype=torch.float32,
+                attn_implementation=attn_implementation
+            ).to("cuda" if use_cuda else "cpu")
+            
+    def _compile_local_model(self):
+        """Compile the decode step into CUDA graphs
+        
+        A static KV cache keeps the decode shapes fixed, which is what lets
+        "reduce-overhead" capture a single graph per step. bitsandbytes INT8
+        layers don't compile, so the quantized model is left alone.
+        """
+        import torch
+        
+        if not self.config.compile_model or not hasattr(torch, 'compile'):
+            return
+        if not torch.cuda.is_available() or getattr(self.local_model, 'is_loaded_in_8bit', False):
+            return
+            
+        try:
+            self.local_model.forward = torch.compile(
+                self.local_model.forward, mode="reduce-overhead", fullgraph=True
+            )
+            self.local_compiled = True
+        except Exception as e:
+            print(f"Failed to compile local model: {e}")
+            
+    def _prefill_system_prompt(self):
+        """Tokenize SYSTEM_PROMPT once and run it through the model
+        
+        Every local prompt starts with SYSTEM_PROMPT, so each generate call
+        starts from a copy of this KV cache and only prefills the context and
+        question. The compiled model decodes into its own static cache, so it
+        gets the token ids but no prefix cache.
+        """
+        import torch
+        
+        self.system_ids = self.local_tokenizer(
+            SYSTEM_PROMPT, return_tensors="pt"
+        ).input_ids.to(self.local_model.device)
+        if self.local_compiled:
+            return
+            
+        try:
+            from transformers import DynamicCache
+            
+            with torch.no_grad():
+                self.system_cache = self.local_model(
+                    self.system_ids, past_key_values=DynamicCache(), use_cache=True
+                ).past_key_values
+        except Exception as e:
+            print(f"Failed to prefill system prompt: {e}")
+                
+    def generate_response(self, prompt: str, context: Dict = None,
+                          on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Generate a response using available AI service
+        
+        on_chunk is called with each piece of text as it is generated when
+        the provider supports streaming (local model only).
+        """
+        # Repeated questions with the same context are answered from the cache
+        cache_key = self._cache_key(prompt, context)
+        response = self._get_cached_response(cache_key)
+        if response is not None:
+            return response
+            
         # Add context to prompt
         full_prompt = self._build_prompt(prompt, context)
         
         try:
-            if self.config.use_openai and OPENAI_AVAILABLE:
-                return self._generate_openai(full_prompt)
-            elif self.config.use_local and self.local_pipeline:
-                return self._generate_local(full_prompt)
+            if self.config.use_openai and self.openai_client:
+                response = self._generate_openai(full_prompt)
+            elif self.config.use_local and self.local_model:
+                response = self._generate_local(full_prompt, on_chunk)
             else:
-                return self._generate_fallback(prompt, context)
+                response = self._generate_fallback(prompt, context)
         except Exception as e:
             return f"Error generating response: {str(e)}"
             
-    def _build_prompt(self, prompt: str, context: Dict = None) -> str:
-        """Build a complete prompt with context"""
-        system_prompt = """You are an AI assistant specializing in Command & Conquer Generals modding.
-You have deep knowledge of:
-- Unit balance and game mechanics
-- INI file structure and syntax
-- Weapon systems and damage calculations
-- The relationship between different game objects
-
-Provide helpful, specific advice for modding the game."""
+        self._cache_response(cache_key, response)
+        return response
+        
+    def _cache_key(self, prompt: str, context: Dict = None) -> Tuple[str, str]:
+        """Build a hashable cache key from a prompt and its context"""
+        # Context holds lists and dicts, so serialize it to make it hashable
+        return prompt, json.dumps(context, sort_keys=True, default=str) if context else ""
+        
+    def _get_cached_response(self, key: Tuple[str, str]) -> Optional[str]:
+        """Look up a cached response, marking it as recently used"""
+        with self.cache_lock:
+            response = self.response_cache.get(key)
+            if response is not None:
+                self.response_cache.move_to_end(key)
+            return response
+            
+    def _cache_response(self, key: Tuple[str, str], response: str):
+        """Cache a successful response, evicting the least recently used"""
+        if not response or response.startswith(ERROR_PREFIXES):
+            return
+        with self.cache_lock:
+            self.response_cache[key] = response
+            self.response_cache.move_to_end(key)
+            while len(self.response_cache) > self.RESPONSE_CACHE_SIZE:
+                self.response_cache.popitem(last=False)
+                
 
+    def generate_batch(self, requests: List[Tuple[str, Dict]]) -> List[str]:
+        """Generate responses for several (prompt, context) requests
+        
+        With the local model the prompts are padded into one batch so each
+        decode step reads the weights once for all of them. Other providers
+        just answer the requests in turn. Batched replies are not streamed and
+        skip the system-prompt KV cache used for single prompts. A compiled model
+        answers one at a time too, since every new batch shape would recompile it.
+        """
+        if (len(requests) > 1 and not self.config.use_openai and self.config.use_local
+                and self.local_model and not self.local_compiled):
+            prompts = [self._format_prompt(self._build_prompt(prompt, context))
+                       for prompt, context in requests]
+            responses = self._generate_local_batch(prompts)
+            for (prompt, context), response in zip(requests, responses):
+                self._cache_response(self._cache_key(prompt, context), response)
+            return responses
+            
+        return [self.generate_response(prompt, context) for prompt, context in requests]
+        
+    async def generate_response_async(self, prompt: str, context: Dict = None) -> str:
+        """Generate a response without blocking the event loop
+        
+        OpenAI requests go through the async client so several can be in
+        flight at once; other providers run in a worker thread.
+        """
+        if not (self.config.use_openai and self.openai_async_client):
+            return await asyncio.to_thread(self.generate_response, prompt, context)
+            
+        cache_key = self._cache_key(prompt, context)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+            
+        try:
+            response = await self.openai_async_client.chat.completions.create(
+                model=self.config.openai_model,
+                messages=self._openai_messages(self._build_prompt(prompt, context)),
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens
+            )
+        except Exception as e:
+            return f"OpenAI Error: {str(e)}"
+            
+        content = response.choices[0].message.content
+        self._cache_response(cache_key, content)
+        return content
+            
+    def _build_prompt(self, prompt: str, context: Dict = None) -> Dict[str, str]:
+        """Build the system and user parts of a prompt with context"""
+        parts = []
         if context:
-            context_str = "\n\nCurrent Context:\n"
             if 'current_unit' in context:
-                context_str += f"Current Unit: {context['current_unit']}\n"
+                parts.append(f"Current Unit: {context['current_unit']}")
             if 'unit_stats' in context:
-                context_str += f"Unit Stats: {json.dumps(context['unit_stats'], indent=2)}\n"
+                stats = "\n".join(f"  {key}: {value}" for key, value in context['unit_stats'].items())
+                parts.append(f"Unit Stats:\n{stats}")
             if 'selected_nodes' in context:
-                context_str += f"Selected Objects: {', '.join(context['selected_nodes'])}\n"
+                parts.append(f"Selected Objects: {', '.join(context['selected_nodes'])}")
+                
+        if parts:
+            system = SYSTEM_PROMPT + "\n\nCurrent Context:\n" + "\n".join(parts)
         else:
-            context_str = ""
+            system = SYSTEM_PROMPT
             
-        return f"{system_prompt}{context_str}\n\nUser: {prompt}\n\nAssistant:"
+        return {'system': system, 'user': prompt}
+        
+    def _format_prompt(self, prompt: Dict[str, str]) -> str:
+        """Flatten a built prompt into plain text for the local model"""
+        return f"{prompt['system']}\n\nUser: {prompt['user']}\n\nAssistant:"
+        
+    def _openai_messages(self, prompt: Dict[str, str]) -> List[Dict[str, str]]:
+        """Convert a built prompt into OpenAI chat messages"""
+        return [
+            {"role": "system", "content": prompt['system']},
+            {"role": "user", "content": prompt['user']}
+        ]
         
-    def _generate_openai(self, prompt: str) -> str:
+    def _generate_openai(self, prompt: Dict[str, str]) -> str:
         """Generate response using OpenAI API"""
         try:
-            if hasattr(openai, 'ChatCompletion'):  # Older API version
-                response = openai.ChatCompletion.create(
-                    model=self.config.openai_model,
-                    messages=[
-                        {"role": "system", "content": prompt.split('\n\nUser:')[0]},
-                        {"role": "user", "content": prompt.split('\n\nUser:')[1].split('\n\nAssistant:')[0]}
-                    ],
-                    temperature=self.config.temperature,
-                    max_tokens=self.config.max_tokens
-                )
-                return response.choices[0].message.content
-            else:  # Newer API version
-                client = openai.OpenAI(api_key=self.config.openai_api_key)
-                response = client.chat.completions.create(
-                    model=self.config.openai_model,
-                    messages=[
-                        {"role": "system", "content": prompt.split('\n\nUser:')[0]},
-                        {"role": "user", "content": prompt.split('\n\nUser:')[1].split('\n\nAssistant:')[0]}
-                    ],
-                    temperature=self.config.temperature,
-                    max_tokens=self.config.max_tokens
-                )
-                return response.choices[0].message.content
+            response = self.openai_client.chat.completions.create(
+                model=self.config.openai_model,
+                messages=self._openai_messages(prompt),
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens
+            )
+            return response.choices[0].message.content
         except Exception as e:
             return f"OpenAI Error: {str(e)}"
             
-    def _generate_local(self, prompt: str) -> str:
-        """Generate response using local model"""
+    def _local_input_ids(self, prompt: Dict[str, str]):
+        """Token ids for a built prompt, reusing the pre-tokenized system prompt"""
+        import torch
+        
+        # Only the context and question after SYSTEM_PROMPT need tokenizing
+        rest = self._format_prompt(prompt)[len(SYSTEM_PROMPT):]
+        rest_ids = self.local_tokenizer(
+            rest, return_tensors="pt", add_special_tokens=False
+        ).input_ids.to(self.local_model.device)
+        return torch.cat([self.system_ids, rest_ids], dim=-1)
+        
+    def _generate_local(self, prompt: Dict[str, str],
+                        on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Generate response using local model, streaming tokens as they come"""
+        import torch
+        from transformers import TextIteratorStreamer
+        
         try:
-            response = self.local_pipeline(
-                prompt,
+            input_ids = self._local_input_ids(prompt)
+            
+            generate_kwargs = dict(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
                 max_new_tokens=self.config.max_tokens,
                 temperature=self.config.temperature,
                 do_sample=True,
                 top_p=0.95,
-                pad_token_id=self.local_pipeline.tokenizer.eos_token_id
+                use_cache=True,
+                pad_token_id=self.local_tokenizer.eos_token_id
             )
+            if self.local_compiled:
+                generate_kwargs['cache_implementation'] = "static"
+            elif self.system_cache is not None:
+                # generate() extends the cache in place, so hand it a copy
+                generate_kwargs['past_key_values'] = copy.deepcopy(self.system_cache)
+                
+            if not on_chunk:
+                # Nobody is listening, so skip the streamer and drop the prompt by token count
+                outputs = self._run_generate(**generate_kwargs)
+                new_tokens = outputs[0, input_ids.shape[-1]:]
+                return self.local_tokenizer.decode(new_tokens, skip_special_tokens=True).strip()
+                
+            streamer = TextIteratorStreamer(
+                self.local_tokenizer, skip_prompt=True, skip_special_tokens=True,
+                timeout=self.STREAM_TIMEOUT
+            )
+            generate_kwargs['streamer'] = streamer
+            errors = []
             
-            # Extract generated text
-            generated = response[0]['generated_text']
-            # Remove the prompt from the response
-            if prompt in generated:
-                generated = generated.replace(prompt, '').strip()
+            def generate():
+                # Always end the stream, or a failed generate() leaves the loop below waiting
+                try:
+                    self._run_generate(**generate_kwargs)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    streamer.end()
+                    
+            # generate() blocks until done, so run it aside and drain the streamer here
+            generation = threading.Thread(target=generate)
+            generation.daemon = True
+            generation.start()
             
-            return generated
+            chunks = []
+            for chunk in streamer:
+                chunks.append(chunk)
+                on_chunk(chunk)
+            generation.join()
+            if errors:
+                raise errors[0]
+                
+            return ''.join(chunks).strip()
         except Exception as e:
             return f"Local Model Error: {str(e)}"
             
+    def _run_generate(self, **kwargs):
+        """Run model.generate without autograd bookkeeping"""
+        import torch
+        
+        # inference_mode is per thread, so enter it wherever generate runs
+        with torch.inference_mode():
+            return self.local_model.generate(**kwargs)
+            
+    def _generate_local_batch(self, prompts: List[str]) -> List[str]:
+        """Generate responses for several prompts in one local model call"""
+        try:
+            tokenizer = self.local_tokenizer
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            # Left padding keeps every prompt's last token aligned for decoding;
+            # the tokenizer is shared through LOCAL_MODEL_CACHE, so put it back after
+            padding_side = tokenizer.padding_side
+            tokenizer.padding_side = "left"
+            try:
+                inputs = tokenizer(prompts, padding=True, return_tensors="pt").to(self.local_model.device)
+            finally:
+                tokenizer.padding_side = padding_side
+            outputs = self._run_generate(
+                **inputs,
+                max_new_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                do_sample=True,
+                top_p=0.95,
+                use_cache=True,
+                pad_token_id=tokenizer.eos_token_id
+            )
+            
+            new_tokens = outputs[:, inputs['input_ids'].shape[1]:]
+            return [text.strip() for text in
+                    tokenizer.batch_decode(new_tokens, skip_special_tokens=True)]
+        except Exception as e:
+            return [f"Local Model Error: {str(e)}"] * len(prompts)
+            
     def _generate_fallback(self, prompt: str, context: Dict = None) -> str:
         """Fallback responses when no AI is available"""
         # Pattern matching for common requests
-        prompt_lower = prompt.lower()
+        hits = {match.lower() for match in FALLBACK_KEYWORDS.findall(prompt)}
         
-        if "balance" in prompt_lower:
+        if "balance" in hits:
             return self._balance_suggestions(context)
-        elif "create" in prompt_lower and ("unit" in prompt_lower or "weapon" in prompt_lower):
-            return self._creation_suggestions(prompt_lower)
-        elif "counter" in prompt_lower:
+        elif "create" in hits and ("unit" in hits or "weapon" in hits):
+            return self._creation_suggestions(prompt.lower())
+        elif "counter" in hits:
             return self._counter_suggestions(context)
-        elif "improve" in prompt_lower or "optimize" in prompt_lower:
+        elif "improve" in hits or "optimize" in hits:
             return self._improvement_suggestions(context)
         else:
             return """I can help you with:
@@ -303,16 +727,19 @@ Example Improvements:
             'suggestions': []
         }
         
+        damage, fire_rate, clip_size, reload_time, attack_range, damage_type = \
+            WEAPON_FIELDS({**WEAPON_DEFAULTS, **weapon_data})
+        
         # Calculate DPS
-        damage = float(weapon_data.get('PrimaryDamage', 0))
-        fire_rate = float(weapon_data.get('DelayBetweenShots', 1000)) / 1000.0
-        clip_size = int(weapon_data.get('ClipSize', 0))
-        reload_time = float(weapon_data.get('ClipReloadTime', 0)) / 1000.0
+        damage = float(damage)
+        fire_rate = float(fire_rate) / 1000.0
+        clip_size = int(clip_size)
+        reload_time = float(reload_time) / 1000.0
         
         if clip_size > 0:
             # Calculate with reload
             total_time = (clip_size - 1) * fire_rate + reload_time
-            dps = (damage * clip_size) / total_time
+            dps = (damage * clip_size) / total_time if total_time > 0 else 0
         else:
             # Continuous fire
             dps = damage / fire_rate if fire_rate > 0 else 0
@@ -320,29 +747,57 @@ Example Improvements:
         analysis['dps'] = round(dps, 2)
         
         # Analyze effectiveness vs different targets
-        damage_type = weapon_data.get('DamageType', 'NORMAL')
+        analysis['effectiveness'] = WEAPON_EFFECTIVENESS.get(damage_type, DEFAULT_EFFECTIVENESS)._asdict()
         
-        effectiveness_map = {
-            'ARMOR_PIERCING': {'vehicles': 'High', 'infantry': 'Low', 'buildings': 'Medium'},
-            'SMALL_ARMS': {'vehicles': 'Low', 'infantry': 'High', 'buildings': 'Low'},
-            'EXPLOSION': {'vehicles': 'Medium', 'infantry': 'High', 'buildings': 'High'},
-            'FLAME': {'vehicles': 'Low', 'infantry': 'Very High', 'buildings': 'Medium'},
-        }
+        # Generate suggestions
+        analysis['suggestions'] = self._weapon_suggestions(dps, float(attack_range))
+            
+        return analysis
         
-        analysis['effectiveness'] = effectiveness_map.get(damage_type, {
-            'vehicles': 'Medium', 'infantry': 'Medium', 'buildings': 'Medium'
-        })
+    def analyze_weapons_batch(self, weapons: List[Dict]) -> List[Dict[str, Any]]:
+        """Analyze many weapons at once, computing DPS as whole arrays"""
+        if not NUMPY_AVAILABLE or not weapons:
+            return [self.analyze_weapon(weapon) for weapon in weapons]
+        compute_dps = load_compute_dps()
+            
+        # One column per stat; INI values may still be strings
+        damage, fire_rate, clip_size, reload_time, attack_range, damage_types = zip(
+            *(WEAPON_FIELDS({**WEAPON_DEFAULTS, **w}) for w in weapons)
+        )
+        damage = np.array(damage, dtype=np.float64)
+        fire_rate = np.array(fire_rate, dtype=np.float64) / 1000.0
+        clip_size = np.array(clip_size, dtype=np.float64).astype(np.int64)
+        reload_time = np.array(reload_time, dtype=np.float64) / 1000.0
+        attack_range = np.array(attack_range, dtype=np.float64)
         
-        # Generate suggestions
+        dps = np.round(compute_dps(damage, fire_rate, clip_size, reload_time), 2)
+        
+        # Flag every weapon at once instead of branching per weapon
+        flags = ((dps < 10) * LOW_DPS | (dps > 100) * HIGH_DPS |
+                 (attack_range > 200) * LONG_RANGE)
+        
+        results = []
+        for damage_type, weapon_dps, weapon_flags in zip(damage_types, dps.tolist(), flags.tolist()):
+            results.append({
+                'dps': weapon_dps,
+                'effectiveness': WEAPON_EFFECTIVENESS.get(damage_type, DEFAULT_EFFECTIVENESS)._asdict(),
+                'suggestions': list(SUGGESTIONS_BY_FLAGS[weapon_flags])
+            })
+            
+        return results
+        
+    def _weapon_suggestions(self, dps: float, attack_range: float) -> List[str]:
+        """Balance suggestions for a weapon's DPS and range"""
+        suggestions = []
         if dps < 10:
-            analysis['suggestions'].append("Very low DPS - consider increasing damage or fire rate")
+            suggestions.append(WEAPON_SUGGESTION_TEXT[LOW_DPS])
         elif dps > 100:
-            analysis['suggestions'].append("Very high DPS - may be overpowered")
+            suggestions.append(WEAPON_SUGGESTION_TEXT[HIGH_DPS])
             
-        if float(weapon_data.get('AttackRange', 0)) > 200:
-            analysis['suggestions'].append("Long range weapon - ensure it has drawbacks")
+        if attack_range > 200:
+            suggestions.append(WEAPON_SUGGESTION_TEXT[LONG_RANGE])
             
-        return analysis
+        return suggestions
 
 class AIAssistantDialog:
     """Dialog window for AI Assistant interaction"""
@@ -351,6 +806,20 @@ class AIAssistantDialog:
         self.parent = parent
         self.integration = node_editor_integration
         self.ai = None
+        self.event_loop = None  # Runs concurrent OpenAI requests
+        self.context_cache_key = None
+        self.context_cache = None
+        
+        # A single worker serves local/built-in requests one at a time
+        self.request_queue = queue.Queue()
+        self.worker = threading.Thread(target=self._worker_loop)
+        self.worker.daemon = True
+        self.worker.start()
+        
+        # Streamed (text, tags) pieces are buffered and flushed to the chat in bursts
+        self.pending_chunks = []
+        self.pending_lock = threading.Lock()
+        self.flush_scheduled = False
         
         # Create dialog
         self.dialog = tk.Toplevel(parent)
@@ -410,11 +879,18 @@ class AIAssistantDialog:
         chat_frame.pack(fill=tk.BOTH, expand=True)
         
         # Chat history
+        # No undo stack, it would keep every response for the whole session
         self.chat_display = scrolledtext.ScrolledText(
-            chat_frame, wrap=tk.WORD, height=20, font=('Arial', 10)
+            chat_frame, wrap=tk.WORD, height=20, font=('Arial', 10),
+            undo=False, maxundo=0
         )
         self.chat_display.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Read-only through bindings so inserts don't have to toggle state
+        self.chat_display.bind("<Key>", self._chat_key)
+        for event in ("<<Paste>>", "<<Cut>>", "<<Clear>>", "<<PasteSelection>>"):
+            self.chat_display.bind(event, lambda e: "break")
+        
         # Configure tags for formatting
         self.chat_display.tag_configure("user", foreground="#0066CC", font=('Arial', 10, 'bold'))
         self.chat_display.tag_configure("ai", foreground="#009900", font=('Arial', 10, 'bold'))
@@ -471,16 +947,18 @@ What would you like to work on?""")
         config = AIConfig()
         
         if self.provider_var.get() == "openai" and hasattr(self, 'api_key_var'):
-            config.use_openai = True
-            config.openai_api_key = self.api_key_var.get()
-            config.use_local = False
+            config = replace(config, use_openai=True, use_local=False,
+                             openai_api_key=self.api_key_var.get())
         elif self.provider_var.get() == "local":
-            config.use_local = True
-            config.use_openai = False
+            config = replace(config, use_local=True, use_openai=False)
         else:
-            config.use_local = False
-            config.use_openai = False
+            config = replace(config, use_local=False, use_openai=False)
             
+        # Free the old local model if the new settings want a different one
+        if self.ai and self.ai.local_model_key and config.use_local:
+            if local_model_key(config) != self.ai.local_model_key:
+                self.ai.unload()
+                
         self.ai = AIAssistant(config)
         
     def apply_settings(self):
@@ -490,17 +968,29 @@ What would you like to work on?""")
         
     def add_message(self, sender: str, message: str):
         """Add a message to the chat display"""
-        self.chat_display.config(state='normal')
+        self._flush_chunks()  # Finish any streamed reply before this one
+        self.chat_display.insert(tk.END, f"{sender}: ", sender.lower(), f"{message}\n\n")
+        self.chat_display.see(tk.END)
         
-        # Add sender
+    def start_message(self, sender: str):
+        """Start a new message in the chat display"""
+        self._flush_chunks()
         self.chat_display.insert(tk.END, f"{sender}: ", sender.lower())
+        self.chat_display.see(tk.END)
         
-        # Add message
-        self.chat_display.insert(tk.END, f"{message}\n\n")
-        
-        self.chat_display.config(state='disabled')
+    def append_text(self, text: str):
+        """Append text to the message currently in the chat display"""
+        self.chat_display.insert(tk.END, text)
         self.chat_display.see(tk.END)
         
+    def _chat_key(self, event):
+        """Let navigation and copy keys through to the chat display, block edits"""
+        if event.keysym in ('Left', 'Right', 'Up', 'Down', 'Prior', 'Next', 'Home', 'End'):
+            return None
+        if event.state & 0x4 and event.keysym.lower() in ('c', 'a'):
+            return None
+        return "break"
+        
     def send_message(self):
         """Send a message to the AI"""
         message = self.input_var.get().strip()
@@ -516,37 +1006,128 @@ What would you like to work on?""")
         # Get context
         context = self.get_current_context()
         
-        # Generate response in thread to avoid blocking UI
-        def generate():
-            try:
-                response = self.ai.generate_response(message, context)
-                self.dialog.after(0, lambda: self.add_message("AI", response))
-            except Exception as e:
-                self.dialog.after(0, lambda: self.add_message("Error", str(e)))
+        # OpenAI requests share one event loop so quick actions run concurrently
+        if self.ai.openai_async_client:
+            asyncio.run_coroutine_threadsafe(
+                self._respond_async(message, context), self._get_event_loop()
+            )
+            return
+            
+        # Generate response on the worker thread to avoid blocking UI
+        self.request_queue.put((message, context))
+        
+    def _worker_loop(self):
+        """Serve queued requests, serializing access to the local model"""
+        while True:
+            requests = [self.request_queue.get()]
+            
+            # Pick up anything queued right behind it so it can share a batch
+            while len(requests) < self.ai.config.max_batch_size:
+                try:
+                    requests.append(self.request_queue.get(timeout=0.01))
+                except queue.Empty:
+                    break
+                    
+            if len(requests) == 1 or self.ai.local_compiled:
+                # A compiled model isn't batched, so keep streaming each reply
+                for message, context in requests:
+                    self._respond(message, context)
+            else:
+                self._respond_batch(requests)
                 
-        thread = threading.Thread(target=generate)
-        thread.daemon = True
-        thread.start()
+    def _queue_chunk(self, chunk: str, tags: Tuple[str, ...] = ()):
+        """Buffer streamed text, scheduling a flush if none is pending"""
+        with self.pending_lock:
+            self.pending_chunks.append((chunk, tags))
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        # ~30 flushes a second is plenty and keeps token bursts off the Tk loop
+        self.dialog.after(30, self._flush_chunks)
+        
+    def _flush_chunks(self):
+        """Insert all buffered text into the chat in one go"""
+        with self.pending_lock:
+            chunks = self.pending_chunks
+            self.pending_chunks = []
+            self.flush_scheduled = False
+        if chunks:
+            # Text.insert takes alternating text and tags arguments
+            self.chat_display.insert(tk.END, *(arg for chunk in chunks for arg in chunk))
+            self.chat_display.see(tk.END)
+            
+    def _respond_batch(self, requests: List[Tuple[str, Dict]]):
+        """Generate responses for several requests and post them in order"""
+        try:
+            responses = self.ai.generate_batch(requests)
+            for response in responses:
+                self.dialog.after(0, self.add_message, "AI", response)
+        except Exception as e:
+            self.dialog.after(0, self.add_message, "Error", str(e))
+            
+    def _respond(self, message: str, context: Dict):
+        """Generate a response and stream it into the chat"""
+        streamed = []
+        
+        def on_chunk(chunk):
+            if not streamed:
+                # The header goes through the buffer too, so it stays in order
+                self._queue_chunk("AI: ", ("ai",))
+            streamed.append(chunk)
+            self._queue_chunk(chunk)
+            
+        try:
+            response = self.ai.generate_response(message, context, on_chunk)
+            if streamed:
+                self._queue_chunk("\n\n")
+            else:
+                self.dialog.after(0, self.add_message, "AI", response)
+        except Exception as e:
+            self.dialog.after(0, self.add_message, "Error", str(e))
+            
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the background event loop, starting it on first use"""
+        if self.event_loop is None:
+            self.event_loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self.event_loop.run_forever)
+            thread.daemon = True
+            thread.start()
+        return self.event_loop
         
+    async def _respond_async(self, message: str, context: Dict):
+        """Generate a response on the event loop and post it to the chat"""
+        try:
+            response = await self.ai.generate_response_async(message, context)
+            self.dialog.after(0, self.add_message, "AI", response)
+        except Exception as e:
+            self.dialog.after(0, self.add_message, "Error", str(e))
+            
     def get_current_context(self) -> Dict:
         """Get current context from the node editor"""
         context = {}
         
         if self.integration.node_canvas:
+            canvas = self.integration.node_canvas
+            
+            # Reuse the last context while selection and properties are unchanged
+            version = getattr(self.integration, 'properties_version', None)
+            cache_key = (frozenset(canvas.selected_nodes), version)
+            if version is not None and cache_key == self.context_cache_key:
+                return self.context_cache
+                
             # Get selected nodes
             selected = []
-            for node_id in self.integration.node_canvas.selected_nodes:
-                node = self.integration.node_canvas.nodes.get(node_id)
+            for node_id in canvas.selected_nodes:
+                node = canvas.nodes.get(node_id)
                 if node:
-                    selected.append(node.name)
+                    selected.append(node)
                     
             if selected:
-                context['selected_nodes'] = selected
+                context['selected_nodes'] = [node.name for node in selected]
                 
                 # If single unit selected, get its stats
                 if len(selected) == 1:
-                    node = next(n for n in self.integration.node_canvas.nodes.values() 
-                               if n.name == selected[0])
+                    node = selected[0]
                     if node.node_type.value == "unit":
                         context['current_unit'] = node.name
                         context['unit_stats'] = {
@@ -557,6 +1138,9 @@ What would you like to work on?""")
                             'speed': self.integration._extract_speed(node),
                         }
                         
+            self.context_cache_key = cache_key
+            self.context_cache = context
+            
         return context
         
     def analyze_selected(self):
@@ -1,9 +1,15 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog, font
 import struct
 import os
+import sys
+import mmap
+import weakref
+import re
+import fnmatch
+from bisect import bisect_right
+from collections import OrderedDict
 from pathlib import Path
-import io
 from datetime import datetime
 
 # Import node editor components if available
@@ -16,135 +22,249 @@ except ImportError:
     NODE_EDITOR_AVAILABLE = False
     print("Node Editor components not found. Basic functionality only.")
 
+# Printable ASCII maps to itself, everything else to '.'
+HEX_ASCII_TABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+
+FORMAT_OFFSET = "0x{:08X}".format
+
+# Entries larger than this aren't loaded into the text editor
+TEXT_VIEW_LIMIT = 4 * 1024 * 1024
+
+# Linux can copy between files in the kernel, other platforms write from the mapping
+SENDFILE_AVAILABLE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+# Number of recently viewed files whose payload and text are kept
+RENDER_CACHE_SIZE = 8
+
+# Bytes that show up in text files, anything else in the first 4 KB means binary
+TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+
 class FileEntry:
-    def __init__(self, offset, size, path, data=None):
+    def __init__(self, offset, size, path, data=None, archive=None):
         self.offset = offset
         self.size = size
         self.path = path
-        self.data = data
+        self.path_lower = path.lower()
+        # Display strings, filled in by the tree and cleared when size/offset change
+        self.size_str = None
+        self.offset_str = None
+        # Archive the payload is read from, weak so entries don't keep it open
+        self.archive = weakref.ref(archive) if archive is not None else None
+        self.source_offset = offset
+        self._data = data
         self.modified = False
+        self.version = 0  # Bumped whenever the payload is replaced
+        
+    @property
+    def data(self):
+        # Payloads that weren't replaced are read from the mapped archive on
+        # each access instead of being kept in memory
+        if self._data is None and self.archive is not None:
+            archive = self.archive()
+            if archive is not None:
+                return archive.read_payload(self.source_offset, self.size)
+        return self._data
+    
+    @data.setter
+    def data(self, value):
+        self._data = value
+        
+    @property
+    def view(self):
+        # Like data, but a memoryview over the mapped archive instead of a copy
+        if self._data is None and self.archive is not None:
+            archive = self.archive()
+            if archive is not None:
+                return archive.view_payload(self.source_offset, self.size)
+        return None if self._data is None else memoryview(self._data)
         
     def __str__(self):
         return f'path: {self.path}, offset: {self.offset}, size: {self.size}'
 
 class BIGArchive:
+    # Compiled once instead of parsing the format string on every field
+    UINT32_BE = struct.Struct('>I')
+    UINT32_LE = struct.Struct('<I')
+    ENTRY_HEADER = struct.Struct('>II')  # offset, size
+    
     def __init__(self):
         self.header = None
         self.file_size = 0
         self.entries = []
         self.file_data = {}
-        self.original_data = None
+        self.filepath = None
+        self._mm = None
         
     def read_uint32_be(self, data):
-        return struct.unpack('>I', data)[0]
+        return self.UINT32_BE.unpack(data)[0]
     
     def read_uint32_le(self, data):
-        return struct.unpack('<I', data)[0]
+        return self.UINT32_LE.unpack(data)[0]
     
     def write_uint32_be(self, value):
-        return struct.pack('>I', value)
+        return self.UINT32_BE.pack(value)
     
     def write_uint32_le(self, value):
-        return struct.pack('<I', value)
+        return self.UINT32_LE.pack(value)
     
-    def read_string(self, file):
-        name = b""
-        char = file.read(1)
-        while char != b'\0' and char:
-            name += char
-            char = file.read(1)
-        return name.decode('ascii', errors='ignore')
+    def read_cstring(self, buf, pos):
+        # Returns the null terminated string at pos and the position after it
+        end = buf.find(b'\0', pos)
+        if end < 0:
+            end = len(buf)
+        return buf[pos:end].decode('ascii', errors='ignore'), end + 1
     
     def write_string(self, string):
         return string.encode('ascii') + b'\0'
     
+    def read_payload(self, offset, size):
+        return self._mm[offset:offset + size]
+    
+    def view_payload(self, offset, size):
+        # The mapping can't be closed until the returned view is released
+        with memoryview(self._mm) as view:
+            return view[offset:offset + size]
+    
+    def open_source(self):
+        # File descriptor for sendfile copies out of the archive, None if unsupported
+        if SENDFILE_AVAILABLE and self._mm is not None:
+            return os.open(self.filepath, os.O_RDONLY)
+        return None
+    
+    def write_payload(self, f, entry, source_fd=None):
+        if entry._data is None and entry.archive is not None:
+            if source_fd is not None:
+                f.flush()
+                self.sendfile(f.fileno(), source_fd, entry.source_offset, entry.size)
+            else:
+                with memoryview(self._mm) as view:
+                    f.write(view[entry.source_offset:entry.source_offset + entry.size])
+        else:
+            f.write(entry.data)
+    
+    def extract_file(self, entry, f):
+        source_fd = self.open_source()
+        try:
+            self.write_payload(f, entry, source_fd)
+        finally:
+            if source_fd is not None:
+                os.close(source_fd)
+    
+    def sendfile(self, out_fd, in_fd, offset, count):
+        while count:
+            sent = os.sendfile(out_fd, in_fd, offset, count)
+            if not sent:
+                raise ValueError("Archive ended before the end of an entry")
+            offset += sent
+            count -= sent
+    
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+    
     def load(self, filepath):
+        self.close()
+        
+        # Map the archive instead of reading it, pages are loaded as entries are used
         with open(filepath, 'rb') as f:
-            self.original_data = f.read()
-            
-        file = io.BytesIO(self.original_data)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.filepath = filepath
+        
+        buf = self._mm
         
         # Read header
-        self.header = file.read(4)
+        self.header = buf[:4]
         if not self.header.startswith(b'BIG'):
             raise ValueError("Not a valid BIG archive")
             
         # Read file size and count
-        self.file_size = self.read_uint32_le(file.read(4))
-        file_count = self.read_uint32_be(file.read(4))
-        
-        # Read entries based on type
-        if self.header == b'BIG5':
-            file.seek(3, 1)  # Skip 3 bytes
-            for i in range(file_count):
-                file.seek(1, 1)  # Skip 1 byte
-                offset = self.read_uint32_be(file.read(4))
-                size = self.read_uint32_be(file.read(4))
-                path = self.read_string(file)
-                self.entries.append(FileEntry(offset, size, path))
-        else:  # BIG4 or BIGF
-            file.seek(4, 1)  # Skip 4 bytes
-            for i in range(file_count):
-                offset = self.read_uint32_be(file.read(4))
-                size = self.read_uint32_be(file.read(4))
-                path = self.read_string(file)
-                self.entries.append(FileEntry(offset, size, path))
-        
-        # Load file data
-        for entry in self.entries:
-            file.seek(entry.offset)
-            entry.data = file.read(entry.size)
+        self.file_size = self.UINT32_LE.unpack_from(buf, 4)[0]
+        file_count = self.UINT32_BE.unpack_from(buf, 8)[0]
+        
+        # Read entries straight from the buffer with a cursor
+        big5 = self.header == b'BIG5'
+        pos = 15 if big5 else 16  # Skip 3 bytes for BIG5, 4 for BIG4 or BIGF
+        skip = 1 if big5 else 0  # Skip 1 byte per entry for BIG5
+        entries = [None] * file_count
+        
+        # Method lookups hoisted out of the per-entry loop
+        unpack_entry = self.ENTRY_HEADER.unpack_from
+        read_cstring = self.read_cstring
+        for i in range(file_count):
+            offset, size = unpack_entry(buf, pos + skip)
+            path, pos = read_cstring(buf, pos + skip + 8)
+            entries[i] = FileEntry(offset, size, path, archive=self)
+        self.entries = entries
             
     def save(self, filepath):
         # Calculate new offsets and total size
-        current_offset = 12  # Header + file_size + file_count
+        big5 = self.header == b'BIG5'
         
-        if self.header == b'BIG5':
-            current_offset += 3  # Skip bytes
-            # Calculate metadata size
-            for entry in self.entries:
-                current_offset += 1  # Skip byte
-                current_offset += 8  # offset + size
-                current_offset += len(entry.path) + 1  # path + null terminator
-        else:
-            current_offset += 4  # Skip bytes
-            # Calculate metadata size
-            for entry in self.entries:
-                current_offset += 8  # offset + size
-                current_offset += len(entry.path) + 1  # path + null terminator
+        # Header + file_size + file_count + skip bytes, then per entry
+        # offset + size + null terminator (+ skip byte for BIG5) and the path
+        current_offset = 15 if big5 else 16
+        current_offset += (10 if big5 else 9) * len(self.entries)
+        current_offset += sum(len(entry.path) for entry in self.entries)
+        
+        metadata_size = current_offset
         
         # Update offsets
         for entry in self.entries:
-            entry.offset = current_offset
+            if entry.offset != current_offset:
+                entry.offset = current_offset
+                entry.offset_str = None
             current_offset += entry.size
             
         total_size = current_offset
         
+        # The mapped archive can't be truncated while entries still read from
+        # it, so overwriting it goes through a temporary file
+        overwrite = self._mm is not None and os.path.exists(filepath) and \
+            os.path.samefile(filepath, self.filepath)
+        target = filepath + '.tmp' if overwrite else filepath
+        
+        # Pack header and metadata into one buffer, skip bytes stay zero
+        metadata = bytearray(metadata_size)
+        metadata[:4] = self.header
+        self.UINT32_LE.pack_into(metadata, 4, total_size)
+        self.UINT32_BE.pack_into(metadata, 8, len(self.entries))
+        
+        pos = 15 if big5 else 16
+        for entry in self.entries:
+            if big5:
+                pos += 1  # Skip byte
+            self.ENTRY_HEADER.pack_into(metadata, pos, entry.offset, entry.size)
+            pos += 8
+            path = self.write_string(entry.path)
+            metadata[pos:pos + len(path)] = path
+            pos += len(path)
+        
         # Write to file
-        with open(filepath, 'wb') as f:
-            # Write header
-            f.write(self.header)
-            f.write(self.write_uint32_le(total_size))
-            f.write(self.write_uint32_be(len(self.entries)))
-            
-            # Write metadata
-            if self.header == b'BIG5':
-                f.write(b'\x00' * 3)  # Skip bytes
-                for entry in self.entries:
-                    f.write(b'\x00')  # Skip byte
-                    f.write(self.write_uint32_be(entry.offset))
-                    f.write(self.write_uint32_be(entry.size))
-                    f.write(self.write_string(entry.path))
-            else:
-                f.write(b'\x00' * 4)  # Skip bytes
-                for entry in self.entries:
-                    f.write(self.write_uint32_be(entry.offset))
-                    f.write(self.write_uint32_be(entry.size))
-                    f.write(self.write_string(entry.path))
+        with open(target, 'wb') as f:
+            f.write(metadata)
             
-            # Write file data
+            # Write file data, payloads that weren't replaced are copied from
+            # the source archive by the kernel where possible, otherwise
+            # straight from the mapping, never read into bytes first
+            source_fd = self.open_source()
+            try:
+                for entry in self.entries:
+                    self.write_payload(f, entry, source_fd)
+            finally:
+                if source_fd is not None:
+                    os.close(source_fd)
+                
+        if overwrite:
+            self.close()
+            os.replace(target, filepath)
+            with open(filepath, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # Everything is on disk now, so replaced payloads can be dropped too
             for entry in self.entries:
-                f.write(entry.data)
+                entry.archive = weakref.ref(self)
+                entry.source_offset = entry.offset
+                entry._data = None
     
     def add_file(self, path, data):
         entry = FileEntry(0, len(data), path, data)
@@ -158,7 +278,9 @@ class BIGArchive:
     def update_file(self, entry, data):
         entry.data = data
         entry.size = len(data)
+        entry.size_str = None
         entry.modified = True
+        entry.version += 1
 
 class FindDialog:
     def __init__(self, parent, text_widget):
@@ -255,20 +377,22 @@ class FindDialog:
             self.match_label.config(text="")
             return
             
-        # Search for all matches
-        start_pos = '1.0'
-        case_sensitive = self.case_var.get()
-        
-        while True:
-            pos = self.text_widget.search(search_term, start_pos, tk.END, 
-                                         nocase=not case_sensitive)
-            if not pos:
-                break
-                
-            end_pos = f"{pos}+{len(search_term)}c"
-            self.matches.append((pos, end_pos))
-            self.text_widget.tag_add('search', pos, end_pos)
-            start_pos = end_pos
+        # Search a snapshot of the text instead of one Tk search per match,
+        # then convert character offsets to line.column indices
+        text = self.text_widget.get('1.0', 'end-1c')
+        flags = 0 if self.case_var.get() else re.IGNORECASE
+        line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        
+        def to_index(offset):
+            line = bisect_right(line_starts, offset)
+            return f"{line}.{offset - line_starts[line - 1]}"
+            
+        for match in re.finditer(re.escape(search_term), text, flags):
+            self.matches.append((to_index(match.start()), to_index(match.end())))
+            
+        # Tag every match in a single call
+        if self.matches:
+            self.text_widget.tag_add('search', *(index for match in self.matches for index in match))
             
         # Update match counter
         if self.matches:
@@ -320,6 +444,76 @@ class FindDialog:
         if self.find_window:
             self.find_window.destroy()
 
+class HexViewer(ttk.Frame):
+    """Hex dump that only formats the lines currently on screen"""
+    def __init__(self, parent, format_hex, bytes_per_line=16):
+        super().__init__(parent)
+        self.format_hex = format_hex
+        self.bytes_per_line = bytes_per_line
+        self.data = b''
+        self.first_line = 0
+        
+        text_font = ('Consolas', 10)
+        self.line_height = font.Font(font=text_font).metrics('linespace')
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(self, wrap=tk.NONE, font=text_font)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Scrolling moves the window over the data instead of the text widget
+        self.text.bind('<Configure>', lambda e: self.render())
+        self.text.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.text.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll(3))
+        self.text.bind('<Up>', lambda e: self.scroll(-1))
+        self.text.bind('<Down>', lambda e: self.scroll(1))
+        self.text.bind('<Prior>', lambda e: self.scroll(-self.visible_lines()))
+        self.text.bind('<Next>', lambda e: self.scroll(self.visible_lines()))
+        
+    def set_data(self, data, first_line=0):
+        # Let go of a view into the archive mapping so it can be closed
+        if isinstance(self.data, memoryview):
+            self.data.release()
+        self.data = data
+        self.first_line = first_line
+        self.render()
+        
+    def total_lines(self):
+        return (len(self.data) + self.bytes_per_line - 1) // self.bytes_per_line
+        
+    def visible_lines(self):
+        return max(1, self.text.winfo_height() // self.line_height)
+        
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.first_line = int(float(args[1]) * self.total_lines())
+        elif args[0] == 'scroll':
+            step = self.visible_lines() if args[2] == 'pages' else 1
+            self.first_line += int(args[1]) * step
+        self.render()
+        
+    def scroll(self, lines):
+        self.first_line += lines
+        self.render()
+        return 'break'
+        
+    def render(self):
+        total = self.total_lines()
+        visible = self.visible_lines()
+        self.first_line = max(0, min(self.first_line, total - visible))
+        
+        # One extra line covers a partially visible last row
+        start = self.first_line * self.bytes_per_line
+        end = start + (visible + 1) * self.bytes_per_line
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', self.format_hex(bytes(self.data[start:end]), self.bytes_per_line, start))
+        
+        if total:
+            self.scrollbar.set(self.first_line / total, min(1.0, (self.first_line + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
 class BIGArchiveEditor:
     def __init__(self, root):
         self.root = root
@@ -330,6 +524,12 @@ class BIGArchiveEditor:
         self.current_file = None
         self.current_entry = None
         self.entry_map = {}  # Maps tree item IDs to entries
+        self.entry_to_item = {}  # Maps entries to tree item IDs
+        self.dir_items = {}  # Maps directory paths to tree item IDs
+        self.text_placeholder = False  # Text editor shows a notice, not the file
+        self.search_index = []  # (path_lower, entry) for every entry, rebuilt with the tree
+        self.render_cache = OrderedDict()  # entry -> (version, data, text, placeholder), LRU order
+        self.pending_filter = None  # after() id of the debounced filter_tree
         self.find_dialog = None  # Will be initialized after text editor is created
         
         self.setup_ui()
@@ -387,7 +587,7 @@ class BIGArchiveEditor:
         
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', self.filter_tree)
+        self.search_var.trace('w', self.on_search_change)
         ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # Tree view
@@ -455,7 +655,7 @@ class BIGArchiveEditor:
         hex_frame = ttk.Frame(self.notebook)
         self.notebook.add(hex_frame, text="Hex Viewer")
         
-        self.hex_viewer = scrolledtext.ScrolledText(hex_frame, wrap=tk.WORD, font=('Consolas', 10))
+        self.hex_viewer = HexViewer(hex_frame, self.format_hex)
         self.hex_viewer.pack(fill=tk.BOTH, expand=True)
         
         # Status bar
@@ -479,8 +679,19 @@ class BIGArchiveEditor:
         
         if filepath:
             try:
-                self.archive = BIGArchive()
-                self.archive.load(filepath)
+                # Load into a fresh archive so a failed open leaves the current one intact
+                archive = BIGArchive()
+                try:
+                    archive.load(filepath)
+                except Exception:
+                    archive.close()
+                    raise
+                if self.archive:
+                    self.hex_viewer.set_data(b'')
+                    self.archive.close()
+                    self.current_entry = None
+                    self.render_cache.clear()
+                self.archive = archive
                 app.node_integration.integrate()
                 self.current_file = filepath
                 self.populate_tree()
@@ -495,13 +706,29 @@ class BIGArchiveEditor:
             return
             
         try:
-            self.archive.save(self.current_file)
+            self.save_to(self.current_file)
             self.update_status(f"Saved: {os.path.basename(self.current_file)}")
             self.refresh_tree()
             messagebox.showinfo("Success", "Archive saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save archive: {str(e)}")
             
+    def save_to(self, filepath):
+        # Saving over the open archive remaps it, which can't happen while the
+        # hex view still holds a view into the old mapping
+        view = self.hex_viewer.data
+        if not isinstance(view, memoryview):
+            self.archive.save(filepath)
+            return
+            
+        first_line = self.hex_viewer.first_line
+        self.hex_viewer.set_data(b'')
+        try:
+            self.archive.save(filepath)
+        finally:
+            if self.current_entry is not None:
+                self.hex_viewer.set_data(self.view_data(self.current_entry), first_line)
+                
     def save_archive_as(self):
         if not self.archive:
             messagebox.showwarning("Warning", "No archive loaded")
@@ -515,7 +742,7 @@ class BIGArchiveEditor:
         
         if filepath:
             try:
-                self.archive.save(filepath)
+                self.save_to(filepath)
                 self.current_file = filepath
                 self.update_status(f"Saved as: {os.path.basename(filepath)}")
                 self.root.title(f"BIG Archive Editor - {os.path.basename(filepath)}")
@@ -526,33 +753,101 @@ class BIGArchiveEditor:
     def populate_tree(self):
         self.tree.delete(*self.tree.get_children())
         self.entry_map.clear()  # Clear the entry map
+        self.entry_to_item.clear()
+        self.dir_items.clear()
         
         if not self.archive:
             return
             
-        # Build directory structure
-        dirs = {}
+        self.search_index = [(entry.path_lower, entry) for entry in self.archive.entries]
+        
+        # Build directory structure. Sorted by path, everything under a
+        # directory is contiguous, so the previous file's directory chain only
+        # has to be trimmed to the shared prefix and extended with new nodes
+        stack = []  # (name, item) for each directory of the previous file
         
-        for entry in self.archive.entries:
+        for entry in sorted(self.archive.entries, key=lambda e: e.path):
             parts = entry.path.split('/')
-            parent = ''
             
-            for i, part in enumerate(parts[:-1]):
-                path = '/'.join(parts[:i+1])
-                if path not in dirs:
-                    dirs[path] = self.tree.insert(parent, 'end', text=part, open=False)
-                parent = dirs[path]
+            depth = 0
+            while depth < len(stack) and depth < len(parts) - 1 and stack[depth][0] == parts[depth]:
+                depth += 1
+            del stack[depth:]
+            
+            for part in parts[depth:-1]:
+                item = self.tree.insert(stack[-1][1] if stack else '', 'end', text=part, open=False)
+                stack.append((part, item))
+                self.dir_items['/'.join(parts[:len(stack)])] = item
+            parent = stack[-1][1] if stack else ''
                 
             # Insert file
-            size_str = self.format_size(entry.size)
-            offset_str = f"0x{entry.offset:08X}"
-            modified_str = "Yes" if entry.modified else "No"
-            
             item = self.tree.insert(parent, 'end', text=parts[-1], 
-                                   values=(size_str, offset_str, modified_str),
+                                   values=self.entry_values(entry),
                                    tags=('file',))
             self.entry_map[item] = entry  # Store entry in the map
+            self.entry_to_item[entry] = item
+            
+    def insert_entry_row(self, entry):
+        # Add a single entry to the tree without rebuilding it
+        self.search_index.append((entry.path_lower, entry))
+        
+        search_term = self.search_var.get().lower()
+        if search_term:
+            # Filtered view is flat
+            if not self.search_matcher(search_term)(entry.path_lower):
+                return
+            parent, text = '', entry.path
+        else:
+            parts = entry.path.split('/')
+            parent = ''
+            for i, part in enumerate(parts[:-1]):
+                path = '/'.join(parts[:i+1])
+                if path not in self.dir_items:
+                    self.dir_items[path] = self.tree.insert(parent, 'end', text=part, open=False)
+                parent = self.dir_items[path]
+            text = parts[-1]
             
+        item = self.tree.insert(parent, 'end', text=text,
+                               values=self.entry_values(entry),
+                               tags=('file',))
+        self.entry_map[item] = entry
+        self.entry_to_item[entry] = item
+        
+    def remove_entry_row(self, entry):
+        # Remove a single entry from the tree along with directories it leaves empty
+        self.search_index = [pair for pair in self.search_index if pair[1] is not entry]
+        
+        self.render_cache.pop(entry, None)
+        
+        item = self.entry_to_item.pop(entry, None)
+        if item is None:
+            return
+        del self.entry_map[item]
+        self.tree.delete(item)
+        
+        parts = entry.path.split('/')[:-1]
+        while parts:
+            path = '/'.join(parts)
+            dir_item = self.dir_items.get(path)
+            if dir_item is None or self.tree.get_children(dir_item):
+                break
+            self.tree.delete(dir_item)
+            del self.dir_items[path]
+            parts.pop()
+            
+    def update_entry_row(self, entry):
+        item = self.entry_to_item.get(entry)
+        if item is not None:
+            self.tree.item(item, values=self.entry_values(entry))
+            
+    def entry_values(self, entry):
+        # Tree columns for an entry, formatting strings only when they changed
+        if entry.size_str is None:
+            entry.size_str = self.format_size(entry.size)
+        if entry.offset_str is None:
+            entry.offset_str = FORMAT_OFFSET(entry.offset)
+        return (entry.size_str, entry.offset_str, "Yes" if entry.modified else "No")
+        
     def format_size(self, size):
         for unit in ['B', 'KB', 'MB', 'GB']:
             if size < 1024.0:
@@ -560,7 +855,20 @@ class BIGArchiveEditor:
             size /= 1024.0
         return f"{size:.1f} TB"
         
+    def on_search_change(self, *args):
+        # Filter once typing pauses rather than on every keystroke
+        if self.pending_filter:
+            self.root.after_cancel(self.pending_filter)
+        self.pending_filter = self.root.after(120, self.filter_tree)
+        
+    def search_matcher(self, search_term):
+        # Terms with wildcards match the whole path (*.ini), others any substring
+        if '*' in search_term or '?' in search_term:
+            return re.compile(fnmatch.translate(search_term)).match
+        return lambda path: search_term in path
+        
     def filter_tree(self, *args):
+        self.pending_filter = None
         search_term = self.search_var.get().lower()
         
         if not search_term:
@@ -569,17 +877,17 @@ class BIGArchiveEditor:
             
         self.tree.delete(*self.tree.get_children())
         self.entry_map.clear()  # Clear the entry map
+        self.entry_to_item.clear()
+        self.dir_items.clear()
         
-        for entry in self.archive.entries:
-            if search_term in entry.path.lower():
-                size_str = self.format_size(entry.size)
-                offset_str = f"0x{entry.offset:08X}"
-                modified_str = "Yes" if entry.modified else "No"
-                
+        matches = self.search_matcher(search_term)
+        for path_lower, entry in self.search_index:
+            if matches(path_lower):
                 item = self.tree.insert('', 'end', text=entry.path,
-                                       values=(size_str, offset_str, modified_str),
+                                       values=self.entry_values(entry),
                                        tags=('file',))
                 self.entry_map[item] = entry  # Store entry in the map
+                self.entry_to_item[entry] = item
                 
     def on_tree_select(self, event):
         selection = self.tree.selection()
@@ -605,37 +913,68 @@ class BIGArchiveEditor:
         self.extract_file()
         
     def load_file_content(self, entry):
+        # Going back to a recently viewed file reuses its payload and text
+        cached = self.render_cache.get(entry)
+        if cached is not None and cached[0] == entry.version:
+            self.render_cache.move_to_end(entry)
+            _, data, text, self.text_placeholder = cached
+        else:
+            data = self.view_data(entry)
+            text, self.text_placeholder = self.render_text(data)
+            if len(data) <= TEXT_VIEW_LIMIT:
+                self.render_cache[entry] = (entry.version, data, text, self.text_placeholder)
+                self.render_cache.move_to_end(entry)
+                if len(self.render_cache) > RENDER_CACHE_SIZE:
+                    self.render_cache.popitem(last=False)
+                    
         # Text editor
         self.text_editor.delete('1.0', tk.END)
-        try:
-            text_content = entry.data.decode('utf-8', errors='ignore')
-            self.text_editor.insert('1.0', text_content)
-        except:
-            self.text_editor.insert('1.0', "[Binary file - cannot display as text]")
-            
-        # Hex viewer
-        self.hex_viewer.delete('1.0', tk.END)
-        hex_content = self.format_hex(entry.data)
-        self.hex_viewer.insert('1.0', hex_content)
+        self.text_editor.insert('1.0', text)
+        
+        # Hex viewer only formats the lines on screen
+        self.hex_viewer.set_data(data)
+        
+    def view_data(self, entry):
+        # Payloads too big for the text editor are only shown in the hex view,
+        # which reads them from the mapping instead of copying them into bytes
+        if entry.size > TEXT_VIEW_LIMIT:
+            return entry.view
+        return entry.data
+        
+    def render_text(self, data):
+        # Returns the text editor contents and whether it is a notice rather than the file
+        if len(data) > TEXT_VIEW_LIMIT:
+            return (f"[Large file ({self.format_size(len(data))}) - "
+                    "use Extract File to view or edit it]"), True
+        if data[:4096].translate(None, TEXT_BYTES):
+            return "[Binary file - cannot display as text]", True
+        return data.decode('utf-8', errors='replace'), False
+        
+    def format_hex(self, data, bytes_per_line=16, offset=0):
+        # Convert the whole payload at once, then slice it into lines
+        hex_all = data.hex(' ').upper()
+        ascii_all = data.translate(HEX_ASCII_TABLE).decode('ascii')
+        hex_width = bytes_per_line * 3 - 1
         
-    def format_hex(self, data, bytes_per_line=16):
         lines = []
         for i in range(0, len(data), bytes_per_line):
-            chunk = data[i:i+bytes_per_line]
-            hex_part = ' '.join(f'{b:02X}' for b in chunk)
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
-            lines.append(f'{i:08X}: {hex_part:<48} {ascii_part}')
+            hex_part = hex_all[i * 3:i * 3 + hex_width]
+            lines.append(f'{offset + i:08X}: {hex_part:<48} {ascii_all[i:i + bytes_per_line]}')
         return '\n'.join(lines)
         
     def save_text_changes(self):
         if not self.current_entry:
             return
             
+        if self.text_placeholder:
+            messagebox.showwarning("Warning", "This file can't be edited as text")
+            return
+            
         try:
             new_content = self.text_editor.get('1.0', tk.END).rstrip('\n')
             new_data = new_content.encode('utf-8')
             self.archive.update_file(self.current_entry, new_data)
-            self.refresh_tree()
+            self.update_entry_row(self.current_entry)
             self.update_status(f"Updated: {self.current_entry.path}")
             messagebox.showinfo("Success", "File updated successfully!")
         except Exception as e:
@@ -673,8 +1012,8 @@ class BIGArchiveEditor:
             with open(filepath, 'rb') as f:
                 data = f.read()
                 
-            self.archive.add_file(internal_path, data)
-            self.populate_tree()
+            entry = self.archive.add_file(internal_path, data)
+            self.insert_entry_row(entry)
             self.update_status(f"Added: {internal_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add file: {str(e)}")
@@ -692,7 +1031,7 @@ class BIGArchiveEditor:
         if filepath:
             try:
                 with open(filepath, 'wb') as f:
-                    f.write(self.current_entry.data)
+                    self.archive.extract_file(self.current_entry, f)
                 self.update_status(f"Extracted: {os.path.basename(filepath)}")
                 messagebox.showinfo("Success", "File extracted successfully!")
             except Exception as e:
@@ -705,8 +1044,8 @@ class BIGArchiveEditor:
             
         if messagebox.askyesno("Confirm Delete", f"Delete {self.current_entry.path}?"):
             self.archive.remove_file(self.current_entry)
+            self.remove_entry_row(self.current_entry)
             self.current_entry = None
-            self.populate_tree()
             self.update_status("File deleted")
             
     def replace_file(self):
@@ -724,40 +1063,16 @@ class BIGArchiveEditor:
                 
             self.archive.update_file(self.current_entry, data)
             self.load_file_content(self.current_entry)
-            self.refresh_tree()
+            self.update_entry_row(self.current_entry)
             self.update_status(f"Replaced: {self.current_entry.path}")
             messagebox.showinfo("Success", "File replaced successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to replace file: {str(e)}")
             
     def refresh_tree(self):
-        # Update the tree without losing selection
-        selection = self.tree.selection()
-        selected_path = None
-        
-        if selection and self.current_entry:
-            selected_path = self.current_entry.path
-            
-        self.populate_tree()
-        
-        # Restore selection
-        if selected_path:
-            for item in self.tree.get_children(''):
-                if self.find_and_select_item(item, selected_path):
-                    break
-                    
-    def find_and_select_item(self, item, path):
-        if 'file' in self.tree.item(item, 'tags'):
-            entry = self.entry_map.get(item)
-            if entry and entry.path == path:
-                self.tree.selection_set(item)
-                self.tree.see(item)
-                return True
-                    
-        for child in self.tree.get_children(item):
-            if self.find_and_select_item(child, path):
-                return True
-        return False
+        # Update every row in place, which keeps the selection and open folders
+        for entry, item in self.entry_to_item.items():
+            self.tree.item(item, values=self.entry_values(entry))
 
 if __name__ == '__main__':
     root = tk.Tk()
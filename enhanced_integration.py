@@ -1,256 +1,400 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, field
+from contextlib import contextmanager
 import re
 import math
+import os
+import sys
+import pickle
+import hashlib
+from uuid import uuid4
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from enhanced_node_editor import (
-    EnhancedNodeCanvas, EnhancedNode, NodeType, NodeCategory,
+    EnhancedNodeCanvas, EnhancedNode, EnhancedPort, NodeType, NodeCategory,
     ConnectionType, PropertyRegistry, PropertyMetadata
 )
 
+# Identifiers repeat across every object, so share one string per name
+_intern = sys.intern
+
+OBJECT_KEYWORDS = (
+    'Object', 'Weapon', 'Armor', 'Science', 'Upgrade',
+    'Locomotor', 'CommandSet', 'CommandButton', 'FXList',
+    'ParticleSystem', 'ObjectCreationList', 'SpecialPower',
+)
+# Blocks inside an object that are closed by their own End
+SECTION_TYPES = frozenset(('WeaponSet', 'ArmorSet', 'Prerequisites', 'Conditions'))
+# Properties that may repeat and are collected into a list
+MULTI_VALUE_KEYS = frozenset(('ShowSubObject', 'HideSubObject'))
+
+# Object header such as "Object AmericaTankCrusader"; property lines like
+# "Weapon = PRIMARY CrusaderTankGun" are not headers
+_OBJDEF_RE = re.compile(r'(%s)\s+([^\s=]+)' % '|'.join(OBJECT_KEYWORDS))
+# "Key = value" or "Key value" on an already stripped line
+_PROPERTY_RE = re.compile(r'([^=]*?)\s*=\s*(.*)|(\S+)\s*(.*)')
+# Plain decimal number such as "500", "-2.5" or ".75"
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)')
+
+# Number of recently viewed INI files whose parse result is kept
+PARSE_CACHE_SIZE = 64
+
+# Below this many INI files a process pool costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 8
+
+# Whole-archive parse results are kept here between sessions; bump the
+# version whenever the parsed data classes or relationship maps change
+DISK_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'GeneralsBigEditor')
+DISK_CACHE_VERSION = 1
+
+@dataclass(slots=True)
+class ParsedSection:
+    """Block inside an object: WeaponSet, ArmorSet, Prerequisites or a module"""
+    type: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+    tag: Optional[str] = None  # ModuleTag_XX for modules
+    
+@dataclass(slots=True)
+class ObjectLinks:
+    """Outgoing relationships of one object, fetched with a single lookup"""
+    weapons: List[str]
+    armor: Optional[str]
+    locomotor: Optional[str]
+    general: Optional[str]
+    prerequisites: List[str]
+    
+@dataclass(slots=True)
+class ParsedObject:
+    """Top-level INI definition and where it was read from"""
+    type: str
+    name: str
+    source_file: str
+    line_number: int
+    properties: Dict[str, Any] = field(default_factory=dict)
+    sections: Dict[str, ParsedSection] = field(default_factory=dict)
+    # The same sections grouped by their type, in file order
+    sections_by_type: Dict[str, List[ParsedSection]] = field(default_factory=dict)
+
 class SmartINIParser:
     """Enhanced INI parser that understands relationships"""
     
-    def __init__(self):
+    # Map file names to generals
+    GENERAL_MAPPING = {
+        'AmericaInfantry.ini': 'America',
+        'AmericaVehicle.ini': 'America',
+        'AmericaAir.ini': 'America',
+        'ChinaInfantry.ini': 'China',
+        'ChinaVehicle.ini': 'China',
+        'ChinaAir.ini': 'China',
+        'GLAInfantry.ini': 'GLA',
+        'GLAVehicle.ini': 'GLA',
+        'AirforceGeneral.ini': 'AirforceGeneral',
+        'LaserGeneral.ini': 'LaserGeneral',
+        'SuperweaponGeneral.ini': 'SuperweaponGeneral',
+        'InfantryGeneral.ini': 'InfantryGeneral',
+        'TankGeneral.ini': 'TankGeneral',
+        'DemoGeneral.ini': 'DemoGeneral',
+        'ChemicalGeneral.ini': 'ChemicalGeneral',
+        'StealthGeneral.ini': 'StealthGeneral',
+        'BossGeneral.ini': 'BossGeneral',
+    }
+    
+    def __init__(self, keep_raw: bool = False):
+        self.keep_raw = keep_raw  # Also store each section's raw lines under '_raw'
         self.object_cache = {}  # Cache all parsed objects
         self.relationships = {}  # Track relationships between objects
+        self.object_links = {}  # object -> ObjectLinks, for objects with any outgoing link
+        self.parse_cache = OrderedDict()  # entry -> (version, objects), LRU order
+        # Section type -> handler for its accumulated lines, anything else is generic
+        self.section_handlers = {
+            'WeaponSet': self._process_weapon_set,
+            'ArmorSet': self._process_armor_set,
+            'Prerequisites': self._process_prerequisites,
+        }
         
     def parse_all_ini_files(self, big_editor) -> Dict[str, Any]:
         """Parse all INI files in the archive to build complete picture"""
         all_objects = {}
-        
-        # Get all INI files
-        for entry in big_editor.archive.entries:
-            if entry.path.lower().endswith('.ini'):
-                try:
-                    content = entry.data.decode('utf-8', errors='ignore')
-                    objects = self.parse_ini_content(content, entry.path)
-                    all_objects.update(objects)
-                except:
-                    pass
-                    
+        self.parse_cache.clear()
+        
+        # Get all INI files; the lowered path is kept on the entry, so other
+        # entries are skipped without allocating or touching their payload
+        ini_entries = [
+            entry for entry in big_editor.archive.entries
+            if entry.path_lower.endswith('.ini') and entry.size
+        ]
+        
+        # An unchanged archive reuses the objects and relationships saved last time
+        cache_key = self._disk_cache_key(big_editor.archive, ini_entries)
+        if cache_key is not None:
+            cached = self._load_disk_cache(cache_key)
+            if cached is not None:
+                all_objects, self.relationships, self.object_links = cached
+                return all_objects
+                
+        # Files parse independently, so bigger archives spread them over processes
+        if len(ini_entries) >= PARALLEL_PARSE_MIN_FILES:
+            try:
+                jobs = [(entry.data, entry.path, self.keep_raw) for entry in ini_entries]
+                with ProcessPoolExecutor() as executor:
+                    for objects in executor.map(_parse_ini_job, jobs, chunksize=4):
+                        # Pickling drops interning, so share names with this process again
+                        all_objects.update(_intern_objects(objects))
+                ini_entries = []
+            except (OSError, BrokenProcessPool):
+                # Worker processes couldn't run; parse everything here instead
+                all_objects.clear()
+                
+        for entry in ini_entries:
+            try:
+                content = entry.data.decode('utf-8', errors='ignore')
+                objects = self.parse_ini_content(content, entry.path)
+                all_objects.update(objects)
+            except:
+                pass
+                
         # Build relationship map
         self._build_relationships(all_objects)
         
+        if cache_key is not None:
+            self._save_disk_cache(cache_key, all_objects)
+            
         return all_objects
     
-    def _is_object_definition(self, line: str) -> bool:
-        """Check if line is an object definition"""
-        keywords = ['Object', 'Weapon', 'Armor', 'Science', 'Upgrade', 
-                   'Locomotor', 'CommandSet', 'CommandButton', 'FXList',
-                   'ParticleSystem', 'ObjectCreationList', 'SpecialPower']
-        return any(line.startswith(kw + ' ') for kw in keywords)
-        
+    def _disk_cache_key(self, archive, ini_entries) -> Optional[tuple]:
+        """Identify an archive file and its INI entries, None if it differs from disk"""
+        if not archive.filepath or any(entry.modified for entry in ini_entries):
+            return None
+        try:
+            stat = os.stat(archive.filepath)
+        except OSError:
+            return None
+        return (DISK_CACHE_VERSION, os.path.abspath(archive.filepath), stat.st_mtime_ns,
+                stat.st_size, self.keep_raw,
+                tuple((entry.path, entry.size) for entry in ini_entries))
+                
+    @staticmethod
+    def _disk_cache_path(cache_key) -> str:
+        """Cache file for the archive a key was made from"""
+        digest = hashlib.sha1(cache_key[1].encode('utf-8', errors='ignore')).hexdigest()
+        return os.path.join(DISK_CACHE_DIR, digest + '.pickle')
+        
+    def _load_disk_cache(self, cache_key):
+        """(objects, relationships, object_links) saved under cache_key, or None"""
+        try:
+            with open(self._disk_cache_path(cache_key), 'rb') as f:
+                stored_key, payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable or written by an older version; it is replaced after parsing
+            return None
+        if stored_key != cache_key:
+            return None
+        # Unpickled names are fresh copies, so intern them like a new parse
+        all_objects, relationships, object_links = payload
+        return _intern_objects(all_objects), relationships, object_links
+        
+    def _save_disk_cache(self, cache_key, all_objects):
+        """Store the parse of an archive, replacing any older one for the same file"""
+        path = self._disk_cache_path(cache_key)
+        payload = (all_objects, self.relationships, self.object_links)
+        try:
+            os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump((cache_key, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+            
+    def parse_entry(self, entry) -> Dict[str, Any]:
+        """Parse an archive entry, reusing the result until its payload changes"""
+        cached = self.parse_cache.get(entry)
+        if cached is not None and cached[0] == entry.version:
+            self.parse_cache.move_to_end(entry)
+            return cached[1]
+            
+        content = entry.data.decode('utf-8', errors='ignore')
+        objects = self.parse_ini_content(content, entry.path)
+        self.parse_cache[entry] = (entry.version, objects)
+        self.parse_cache.move_to_end(entry)
+        if len(self.parse_cache) > PARSE_CACHE_SIZE:
+            self.parse_cache.popitem(last=False)
+        return objects
+    
     def parse_ini_content(self, content: str, source_file: str) -> Dict[str, Any]:
         """Parse INI content with source tracking"""
         objects = {}
         current_object = None
-        current_section = None
-        section_stack = []
-        in_section = False
+        current_section = None  # Open section; sections don't nest, End closes it
         section_properties = []
         
-        lines = content.split('\n')
+        # Bound once; the loop below runs for every line of every INI
+        match_objdef = _OBJDEF_RE.match
+        parse_property = self._parse_property
+        process_section = self._process_section_properties
+        keep_raw = self.keep_raw
+        
+        # Drop comments and empty lines before the main loop
+        lines = (
+            (line_num, line)
+            for line_num, line in enumerate(map(str.strip, content.splitlines()))
+            if line and line[0] != ';'
+        )
         
-        for line_num, line in enumerate(lines):
-            line_stripped = line.strip()
-            
-            # Skip comments and empty lines
-            if not line_stripped or line_stripped.startswith(';'):
-                continue
-                
+        for line_num, line_stripped in lines:
             # Object definitions
-            if self._is_object_definition(line_stripped):
-                obj_type, obj_name = self._parse_object_definition(line_stripped)
-                if obj_type and obj_name:
-                    if "=" in obj_name:
-                        obj_name = obj_name.replace("=","")
-                    if obj_name.startswith(" "):
-                        obj_name = obj_name.split(" ")[1]
-                    current_object = {
-                        'type': obj_type,
-                        'name': obj_name,
-                        'source_file': source_file,
-                        'properties': {},
-                        'sections': {},
-                        'line_number': line_num
-                    }
-                    objects[obj_name] = current_object
-                    section_stack = []
-                    in_section = False
-                    
+            obj_match = match_objdef(line_stripped)
+            if obj_match:
+                obj_type, obj_name = obj_match.groups()
+                obj_name = _intern(obj_name)
+                current_object = ParsedObject(obj_type, obj_name, source_file, line_num)
+                objects[obj_name] = current_object
+                current_section = None
+                
             # End statement
             elif line_stripped == 'End':
-                if in_section and current_section:
+                if current_section is not None:
                     # Process accumulated section properties
                     if section_properties:
-                        current_section['properties']['_raw'] = section_properties
-                        self._process_section_properties(current_section, section_properties)
+                        if keep_raw:
+                            current_section.properties['_raw'] = section_properties
+                        process_section(current_section, section_properties)
                         section_properties = []
-                    
-                    if section_stack:
-                        section_stack.pop()
-                        current_section = section_stack[-1] if section_stack else None
-                        in_section = bool(section_stack)
-                    else:
-                        in_section = False
-                        current_section = None
+                        
+                    current_section = None
                 else:
                     current_object = None
                     
             # Section definitions like WeaponSet, ArmorSet, Prerequisites
-            elif current_object and not in_section:
+            elif current_object and current_section is None:
+                eq = line_stripped.find('=')
+                
                 # Check for section start
-                if line_stripped in ['WeaponSet', 'ArmorSet', 'Prerequisites', 'Conditions']:
-                    in_section = True
-                    current_section = {
-                        'type': line_stripped,
-                        'properties': {}
-                    }
-                    current_object['sections'][line_stripped] = current_section
+                if line_stripped in SECTION_TYPES:
+                    current_section = ParsedSection(line_stripped)
+                    current_object.sections[line_stripped] = current_section
+                    current_object.sections_by_type.setdefault(line_stripped, []).append(current_section)
                     section_properties = []
-                    section_stack.append(current_section)
                     
                 # Module definitions (Draw = W3DTankDraw ModuleTag_01)
-                elif '=' in line_stripped and 'ModuleTag_' in line_stripped:
-                    parts = line_stripped.split('=')
-                    section_type = parts[0].strip().split()[0]
-                    module_tag = parts[0].strip().split()[-1]
+                elif eq != -1 and line_stripped.find('ModuleTag_', eq) != -1:
+                    parts = line_stripped[:eq].split()
+                    section_type = _intern(parts[0])
+                    module_tag = _intern(parts[-1])
                     
-                    section = {
-                        'type': section_type,
-                        'tag': module_tag,
-                        'properties': {},
-                        'subsections': {}
-                    }
-                    
-                    current_object['sections'][module_tag] = section
-                    section_stack.append(section)
-                    current_section = section
-                    in_section = True
+                    current_section = ParsedSection(section_type, tag=module_tag)
+                    current_object.sections[module_tag] = current_section
+                    current_object.sections_by_type.setdefault(section_type, []).append(current_section)
                     section_properties = []
                     
                 # Regular property assignments
                 else:
-                    self._parse_property(line_stripped, current_object, None)
+                    parse_property(line_stripped, current_object, None)
                     
             # Inside a section
-            elif current_object and in_section and current_section:
+            elif current_object:
                 # Accumulate section properties
                 section_properties.append(line_stripped)
                 
         return objects
     
-    def _parse_object_definition(self, line: str) -> Tuple[str, str]:
-        """Parse object type and name from definition line"""
-        parts = line.split(None, 1)
-        if len(parts) >= 2:
-            return parts[0], parts[1]
-        return None, None
-        
-    def _parse_property(self, line: str, obj: Dict, section: Optional[Dict]):
+    def _parse_property(self, line: str, obj: ParsedObject, section: Optional[ParsedSection]):
         """Parse a property line"""
-        target = section if section else obj
+        properties = (section or obj).properties
+        key, value, bare_key, bare_value = _PROPERTY_RE.match(line).groups()
         
-        if 'properties' not in target:
-            target['properties'] = {}
-            
         # Regular property handling
-        if '=' in line:
-            parts = line.split('=', 1)
-            key = parts[0].strip()
-            value = parts[1].strip() if len(parts) > 1 else ''
-            
-            # Special handling for Locomotor
-            if key == 'Locomotor':
-                # Store the full value, e.g. "SET_NORMAL HumveeLocomotor"
-                target['properties'][key] = value
-            else:
-                target['properties'][key] = value
+        if bare_key is None:
+            # Locomotor keeps the full value, e.g. "SET_NORMAL HumveeLocomotor"
+            properties[_intern(key)] = value
         else:
             # Properties without '=' 
-            parts = line.split(None, 1)
-            if parts:
-                key = parts[0]
-                value = parts[1] if len(parts) > 1 else ''
-                
-                # Some properties can have multiple values
-                if key in ['ShowSubObject', 'HideSubObject']:
-                    if key not in target['properties']:
-                        target['properties'][key] = []
-                    target['properties'][key].append(value)
-                else:
-                    target['properties'][key] = value
+            key = _intern(bare_key)
+            
+            # Some properties can have multiple values
+            if key in MULTI_VALUE_KEYS:
+                if key not in properties:
+                    properties[key] = []
+                properties[key].append(bare_value)
+            else:
+                properties[key] = bare_value
         
-    def _process_section_properties(self, section: Dict, properties: List[str]):
+    def _process_section_properties(self, section: ParsedSection, properties: List[str]):
         """Process properties within a section"""
-        if section['type'] == 'WeaponSet':
-            weapons = []
-            conditions = None
-            
-            for prop in properties:
-                if prop.startswith('Conditions'):
-                    if '=' in prop:
-                        conditions = prop.split('=', 1)[1].strip()
-                    else:
-                        conditions = 'None'
-                elif prop.startswith('Weapon') and '=' in prop:
-                    # Parse "Weapon = PRIMARY CrusaderTankGun" or "Weapon = SECONDARY TankMachineGun"
-                    parts = prop.split('=', 1)[1].strip().split()
-                    if len(parts) >= 2:
-                        slot = parts[0]  # PRIMARY, SECONDARY, etc.
-                        weapon_name = parts[1]
-                        if "FX" in weapon_name:
-                            continue
-                        weapons.append({
-                            'slot': slot,
-                            'weapon': weapon_name
-                        })
-                        
-            section['properties']['weapons'] = weapons
-            section['properties']['conditions'] = conditions
-            
-        elif section['type'] == 'ArmorSet':
-            armors = []
-            conditions = None
-            
-            for prop in properties:
-                if prop.startswith('Conditions'):
-                    if '=' in prop:
-                        conditions = prop.split('=', 1)[1].strip()
-                    else:
-                        conditions = 'None'
-                elif prop.startswith('Armor') and '=' in prop:
-                    armor_name = prop.split('=', 1)[1].strip()
-                    armors.append(armor_name)
-                elif prop.startswith('DamageFX') and '=' in prop:
-                    section['properties']['DamageFX'] = prop.split('=', 1)[1].strip()
-                    
-            section['properties']['armors'] = armors
-            section['properties']['conditions'] = conditions
-            
-        elif section['type'] == 'Prerequisites':
-            prerequisites = []
-            
-            for prop in properties:
-                if prop.startswith('Object') and '=' in prop:
-                    obj_name = prop.split('=', 1)[1].strip()
-                    prerequisites.append(obj_name)
-                    
-            section['properties']['prerequisites'] = prerequisites
-            
-        else:
-            # Generic section processing
-            for prop in properties:
-                if '=' in prop:
-                    key, value = prop.split('=', 1)
-                    section['properties'][key.strip()] = value.strip()
-                else:
-                    # Store as-is
-                    if '_lines' not in section['properties']:
-                        section['properties']['_lines'] = []
-                    section['properties']['_lines'].append(prop)
+        handler = self.section_handlers.get(section.type, self._process_generic_section)
+        handler(section.properties, properties)
+        
+    def _process_weapon_set(self, props: Dict[str, Any], properties: List[str]):
+        """Collect (slot, weapon) pairs and conditions of a WeaponSet"""
+        weapons = []
+        conditions = None
+        
+        for prop in properties:
+            key, sep, value = prop.partition('=')
+            key = key.strip()
+            if key == 'Conditions':
+                conditions = value.strip() if sep else 'None'
+            elif key == 'Weapon' and sep:
+                # Parse "Weapon = PRIMARY CrusaderTankGun" or "Weapon = SECONDARY TankMachineGun"
+                parts = value.split(None, 2)
+                if len(parts) >= 2:
+                    slot = _intern(parts[0])  # PRIMARY, SECONDARY, etc.
+                    weapon_name = _intern(parts[1])
+                    if "FX" in weapon_name:
+                        continue
+                    weapons.append((slot, weapon_name))
                     
+        props['weapons'] = weapons
+        props['conditions'] = conditions
+        
+    def _process_armor_set(self, props: Dict[str, Any], properties: List[str]):
+        """Collect armors, DamageFX and conditions of an ArmorSet"""
+        armors = []
+        conditions = None
+        
+        for prop in properties:
+            key, sep, value = prop.partition('=')
+            key = key.strip()
+            if key == 'Conditions':
+                conditions = value.strip() if sep else 'None'
+            elif not sep:
+                continue
+            elif key == 'Armor':
+                armors.append(_intern(value.strip()))
+            elif key == 'DamageFX':
+                props['DamageFX'] = value.strip()
+                
+        props['armors'] = armors
+        props['conditions'] = conditions
+        
+    def _process_prerequisites(self, props: Dict[str, Any], properties: List[str]):
+        """Collect the objects listed in a Prerequisites block"""
+        prerequisites = []
+        
+        for prop in properties:
+            key, sep, value = prop.partition('=')
+            if sep and key.strip() == 'Object':
+                prerequisites.append(_intern(value.strip()))
+                
+        props['prerequisites'] = prerequisites
+        
+    def _process_generic_section(self, props: Dict[str, Any], properties: List[str]):
+        """Store key = value pairs of any other section, other lines as-is"""
+        for prop in properties:
+            key, sep, value = prop.partition('=')
+            if sep:
+                props[key.strip()] = value.strip()
+            else:
+                # Store as-is
+                if '_lines' not in props:
+                    props['_lines'] = []
+                props['_lines'].append(prop)
+                
     def _build_relationships(self, all_objects: Dict[str, Any]):
         """Build comprehensive relationship map"""
         self.relationships = {
@@ -263,117 +407,237 @@ class SmartINIParser:
             'upgrade_units': {},     # upgrade -> [units that can use it]
             'unit_upgrades': {},     # unit -> [available upgrades]
             'prerequisites': {},     # object -> [prerequisites]
-            'enables': {},          # object -> [what it enables]
+            'enables': {},           # object -> [what it enables]
         }
+        self.object_links = {}
+        self._link_objects(all_objects)
+        
+    def _update_relationships(self, objects: Dict[str, Any]):
+        """Replace the relationships of re-parsed objects, leaving the rest as is"""
+        self._unlink_objects(objects)
+        self._link_objects(objects)
+        
+    def _link_objects(self, objects: Dict[str, Any]):
+        """Add the relationships of objects to the map"""
+        relationships = self.relationships
+        unit_weapons = relationships['unit_weapons']
+        weapon_units = relationships['weapon_units']
+        unit_armor = relationships['unit_armor']
+        unit_locomotor = relationships['unit_locomotor']
+        unit_general = relationships['unit_general']
+        general_units = relationships['general_units']
+        upgrade_units = relationships['upgrade_units']
+        unit_upgrades = relationships['unit_upgrades']
+        prerequisites = relationships['prerequisites']
+        enables = relationships['enables']
+        object_links = self.object_links
+        extract_general = self._extract_general_from_path
         
         # Scan all objects for relationships
-        for obj_name, obj_data in all_objects.items():
-            obj_type = obj_data.get('type', '').lower()
-           
+        for obj_name, obj_data in objects.items():
+            sections = obj_data.sections
+            weapon_names = prereqs = ()
+            armor = locomotor = general = None
             
             # Extract weapon relationships from WeaponSet section
-            if 'WeaponSet' in obj_data.get('sections', {}):
-                weapon_set = obj_data['sections']['WeaponSet']
-               
-                weapons = weapon_set.get('properties', {}).get('weapons', [])
+            weapon_set = sections.get('WeaponSet')
+            if weapon_set:
                 weapon_names = []
-                for weapon_info in weapons:
-                 
-                    weapon_name = weapon_info.get('weapon')
+                for _slot, weapon_name in weapon_set.properties.get('weapons', ()):
                     if weapon_name:
                         weapon_names.append(weapon_name)
-                        
-                        # Add to weapon->units mapping
-                        if weapon_name not in self.relationships['weapon_units']:
-                            self.relationships['weapon_units'][weapon_name] = []
-                        self.relationships['weapon_units'][weapon_name].append(obj_name)
+                        weapon_units.setdefault(weapon_name, []).append(obj_name)
                         
                 if weapon_names:
-                    self.relationships['unit_weapons'][obj_name] = weapon_names
+                    unit_weapons[obj_name] = weapon_names
                     
             # Extract armor relationships from ArmorSet section
-            if 'ArmorSet' in obj_data.get('sections', {}):
-                armor_set = obj_data['sections']['ArmorSet']
-                armors = armor_set.get('properties', {}).get('armors', [])
+            armor_set = sections.get('ArmorSet')
+            if armor_set:
+                armors = armor_set.properties.get('armors', ())
                 if armors:
                     # Usually just one armor per set
-                    self.relationships['unit_armor'][obj_name] = armors[0]
+                    armor = unit_armor[obj_name] = armors[0]
                     
             # Extract locomotor from properties
-            if 'Locomotor' in obj_data.get('properties', {}):
-                loco_value = obj_data['properties']['Locomotor']
-                # Parse "SET_NORMAL CrusaderLocomotor" format
-                if isinstance(loco_value, str) and ' ' in loco_value:
-                    parts = loco_value.split()
-                    if len(parts) >= 2:
-                        locomotor_name = parts[-1]  # Get the last part
-                        self.relationships['unit_locomotor'][obj_name] = locomotor_name
-                        
+            loco_value = obj_data.properties.get('Locomotor')
+            # Parse "SET_NORMAL CrusaderLocomotor" format
+            if isinstance(loco_value, str) and ' ' in loco_value:
+                parts = loco_value.split()
+                if len(parts) >= 2:
+                    locomotor = unit_locomotor[obj_name] = parts[-1]  # Get the last part
+                    
             # Extract prerequisites from Prerequisites section
-            if 'Prerequisites' in obj_data.get('sections', {}):
-                prereq_section = obj_data['sections']['Prerequisites']
-                prereqs = prereq_section.get('properties', {}).get('prerequisites', [])
+            prereq_section = sections.get('Prerequisites')
+            if prereq_section:
+                prereqs = prereq_section.properties.get('prerequisites', ())
                 if prereqs:
-                    self.relationships['prerequisites'][obj_name] = prereqs
+                    prerequisites[obj_name] = prereqs
                     for prereq in prereqs:
-                        if prereq not in self.relationships['enables']:
-                            self.relationships['enables'][prereq] = []
-                        self.relationships['enables'][prereq].append(obj_name)
+                        enables.setdefault(prereq, []).append(obj_name)
                         
             # Extract general relationships from source file
-            source_file = obj_data.get('source_file', '')
+            source_file = obj_data.source_file
             if source_file.startswith("Object"):
                 # Determine general from file path
-                general = self._extract_general_from_path(source_file)
+                general = extract_general(source_file)
                 if general:
-                    self.relationships['unit_general'][obj_name] = general
-                    if general not in self.relationships['general_units']:
-                        self.relationships['general_units'][general] = []
-                    
-                    self.relationships['general_units'][general].append(obj_name)
+                    unit_general[obj_name] = general
+                    general_units.setdefault(general, []).append(obj_name)
                     
             # Extract upgrade relationships from behavior sections
-            for section_name, section_data in obj_data.get('sections', {}).items():
-                
-                if section_data.get('type') == 'ObjectCreationUpgrade':
-                    props = section_data.get('properties', {})
-                    if 'TriggeredBy' in props:
-                        upgrade_name = props['TriggeredBy']
-                        if obj_name not in self.relationships['unit_upgrades']:
-                            self.relationships['unit_upgrades'][obj_name] = []
-                        self.relationships['unit_upgrades'][obj_name].append(upgrade_name)
+            for section_data in sections.values():
+                if section_data.type == 'ObjectCreationUpgrade':
+                    upgrade_name = section_data.properties.get('TriggeredBy')
+                    if upgrade_name is not None:
+                        unit_upgrades.setdefault(obj_name, []).append(upgrade_name)
+                        upgrade_units.setdefault(upgrade_name, []).append(obj_name)
                         
-                        if upgrade_name not in self.relationships['upgrade_units']:
-                            self.relationships['upgrade_units'][upgrade_name] = []
-                        self.relationships['upgrade_units'][upgrade_name].append(obj_name)
-            
-           
-        
-    def _extract_general_from_path(self, path: str) -> Optional[str]:
+            if weapon_names or armor or locomotor or general or prereqs:
+                object_links[obj_name] = ObjectLinks(weapon_names, armor, locomotor, general, prereqs)
+                
+    def _unlink_objects(self, names):
+        """Remove everything the named objects contributed to the map"""
+        relationships = self.relationships
+        
+        # Forward map, the inverse map it fed, and whether the value is a list
+        pairs = (
+            ('unit_weapons', 'weapon_units', True),
+            ('prerequisites', 'enables', True),
+            ('unit_general', 'general_units', False),
+            ('unit_upgrades', 'upgrade_units', True),
+        )
+        for forward_key, inverse_key, many in pairs:
+            forward = relationships[forward_key]
+            inverse = relationships[inverse_key]
+            for obj_name in names:
+                targets = forward.pop(obj_name, None)
+                if targets is None:
+                    continue
+                for target in (targets if many else (targets,)):
+                    users = inverse.get(target)
+                    if users:
+                        users.remove(obj_name)
+                        if not users:
+                            del inverse[target]
+                            
+        unit_armor = relationships['unit_armor']
+        unit_locomotor = relationships['unit_locomotor']
+        object_links = self.object_links
+        for obj_name in names:
+            unit_armor.pop(obj_name, None)
+            unit_locomotor.pop(obj_name, None)
+            object_links.pop(obj_name, None)
+            
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _extract_general_from_path(path: str) -> Optional[str]:
         """Extract general name from file path"""
-        # Map file names to generals
-        general_mapping = {
-            'AmericaInfantry.ini': 'America',
-            'AmericaVehicle.ini': 'America',
-            'AmericaAir.ini': 'America',
-            'ChinaInfantry.ini': 'China',
-            'ChinaVehicle.ini': 'China',
-            'ChinaAir.ini': 'China',
-            'GLAInfantry.ini': 'GLA',
-            'GLAVehicle.ini': 'GLA',
-            'AirforceGeneral.ini': 'AirforceGeneral',
-            'LaserGeneral.ini': 'LaserGeneral',
-            'SuperweaponGeneral.ini': 'SuperweaponGeneral',
-            'InfantryGeneral.ini': 'InfantryGeneral',
-            'TankGeneral.ini': 'TankGeneral',
-            'DemoGeneral.ini': 'DemoGeneral',
-            'ChemicalGeneral.ini': 'ChemicalGeneral',
-            'StealthGeneral.ini': 'StealthGeneral',
-            'BossGeneral.ini': 'BossGeneral',
-        }
-        
-        filename = path.split('\\')[-1]
-        return general_mapping.get(filename)
+        return SmartINIParser.GENERAL_MAPPING.get(path.rpartition('\\')[2])
+
+def _parse_ini_job(job) -> Dict[str, Any]:
+    """Process pool entry point: decode and parse one (data, path, keep_raw) INI payload"""
+    data, path, keep_raw = job
+    try:
+        return SmartINIParser(keep_raw).parse_ini_content(data.decode('utf-8', errors='ignore'), path)
+    except:
+        return {}
+
+def _intern_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Property dict with interned keys and interned names in parsed section lists"""
+    properties = {_intern(key): value for key, value in properties.items()}
+    if 'weapons' in properties:
+        properties['weapons'] = [(_intern(slot), _intern(name)) for slot, name in properties['weapons']]
+    for key in ('armors', 'prerequisites'):
+        if key in properties:
+            properties[key] = [_intern(name) for name in properties[key]]
+    return properties
+
+def _intern_objects(objects: Dict[str, ParsedObject]) -> Dict[str, ParsedObject]:
+    """Re-intern names of objects unpickled from a worker process"""
+    interned = {}
+    for obj in objects.values():
+        obj.name = _intern(obj.name)
+        obj.properties = _intern_properties(obj.properties)
+        sections = {}
+        for key, section in obj.sections.items():
+            section.type = _intern(section.type)
+            if section.tag is not None:
+                section.tag = _intern(section.tag)
+            section.properties = _intern_properties(section.properties)
+            sections[_intern(key)] = section
+        obj.sections = sections
+        obj.sections_by_type = {_intern(key): value for key, value in obj.sections_by_type.items()}
+        interned[obj.name] = obj
+    return interned
+
+def _rounds_per_minute(delay) -> Optional[str]:
+    """RPM text for a DelayBetweenShots value in ms, None if it isn't a nonzero number"""
+    text = delay.strip() if isinstance(delay, str) else str(delay)
+    if not _NUMBER_RE.fullmatch(text):
+        return None
+    delay_ms = float(text)
+    if not delay_ms:
+        return None
+    return f"{60000 / delay_ms:.0f}"
+
+# Node type for each lowered INI definition keyword; Object depends on KindOf
+OBJECT_NODE_TYPES = {
+    'weapon': NodeType.WEAPON,
+    'armor': NodeType.ARMOR,
+    'science': NodeType.SCIENCE,
+    'upgrade': NodeType.UPGRADE,
+    'locomotor': NodeType.LOCOMOTOR,
+    'commandset': NodeType.COMMANDSET,
+    'commandbutton': NodeType.COMMANDBUTTON,
+    'fxlist': NodeType.FXLIST,
+    'particlesystem': NodeType.PARTICLESYSTEM,
+    'objectcreationlist': NodeType.OCL,
+    'specialpower': NodeType.SPECIALPOWER,
+}
+
+# Names for ports added on demand by _create_typed_connection
+OUTPUT_PORT_NAMES = {
+    ConnectionType.WEAPON_SLOT: "Weapon",
+    ConnectionType.ARMOR_SET: "Armor",
+    ConnectionType.LOCOMOTOR_SET: "Locomotor",
+    ConnectionType.OWNS: "Owns",
+    ConnectionType.PREREQUISITE: "Enables",
+}
+INPUT_PORT_NAMES = {
+    ConnectionType.WEAPON_SLOT: "Used By",
+    ConnectionType.ARMOR_SET: "Used By",
+    ConnectionType.LOCOMOTOR_SET: "Used By",
+    ConnectionType.OWNS: "Owned By",
+    ConnectionType.PREREQUISITE: "Requires",
+}
+
+CONNECTION_COLORS = {
+    ConnectionType.WEAPON_SLOT: "#E74C3C",
+    ConnectionType.ARMOR_SET: "#F39C12",
+    ConnectionType.LOCOMOTOR_SET: "#27AE60",
+    ConnectionType.PREREQUISITE: "#9B59B6",
+    ConnectionType.UPGRADE_GRANTS: "#1ABC9C",
+    ConnectionType.CONFLICTS_WITH: "#C0392B",
+    ConnectionType.OWNS: "#3498DB",
+}
+DEFAULT_CONNECTION_COLOR = "#AAAAAA"
+
+# Units drawn around each general in the overview, evenly spaced on a circle
+OVERVIEW_UNITS_PER_GENERAL = 5
+_UNIT_CIRCLE = [
+    (math.cos(2 * math.pi * j / OVERVIEW_UNITS_PER_GENERAL),
+     math.sin(2 * math.pi * j / OVERVIEW_UNITS_PER_GENERAL))
+    for j in range(OVERVIEW_UNITS_PER_GENERAL)
+]
+
+# Choices offered by the assign-to-general and clone-to-faction dialogs
+ASSIGNABLE_GENERALS = (
+    'America', 'China', 'GLA', 'AirforceGeneral', 'LaserGeneral',
+    'SuperweaponGeneral', 'InfantryGeneral', 'TankGeneral',
+    'DemoGeneral', 'ChemicalGeneral', 'StealthGeneral',
+)
+CLONE_FACTIONS = ('America', 'China', 'GLA')
 
 class EnhancedNodeEditorIntegration:
     """Enhanced integration with automatic loading and smart editing"""
@@ -383,15 +647,31 @@ class EnhancedNodeEditorIntegration:
         self.node_canvas = None
         self.parser = SmartINIParser()
         self.all_objects = {}  # All parsed objects from all INI files
+        self._objs_by_file = {}  # source_file -> names in all_objects defined there
         self.current_view = {}  # Currently visible objects
         self.auto_load_enabled = True
         self.property_editor = None
+        self.properties_version = 0  # Bumped whenever a node property is edited
+        self._dirty_nodes = None  # node id -> node awaiting redraw inside _deferred_redraw
+        self._search_after_id = None  # Pending debounced search filter
+        # Node type -> method filling in that node's quick_stats
+        self.quick_stat_handlers = {
+            NodeType.UNIT: self._unit_quick_stats,
+            NodeType.WEAPON: self._weapon_quick_stats,
+            NodeType.LOCOMOTOR: self._locomotor_quick_stats,
+            NodeType.ARMOR: self._armor_quick_stats,
+            NodeType.GENERAL: self._general_quick_stats,
+        }
         
     def integrate(self):
         """Integrate with the BIG editor"""
         # Parse all INI files on startup
         if self.big_editor.archive:
-            self.all_objects = self.parser.parse_all_ini_files(self.big_editor)
+            self.all_objects = {}
+            self._objs_by_file = {}
+            objects = self.parser.parse_all_ini_files(self.big_editor)
+            self._index_objects_by_file(objects)
+            self.all_objects = objects
             
         # Modify the text editor to auto-load node view
         self._setup_auto_load()
@@ -504,38 +784,48 @@ class EnhancedNodeEditorIntegration:
         
         return toolbar
         
+    def _index_objects_by_file(self, objects):
+        """Record the source file of objects about to be merged into all_objects"""
+        for name, obj_data in objects.items():
+            previous = self.all_objects.get(name)
+            if previous is not None and previous.source_file != obj_data.source_file:
+                self._objs_by_file.get(previous.source_file, set()).discard(name)
+            self._objs_by_file.setdefault(obj_data.source_file, set()).add(name)
+            
     def load_ini_to_nodes(self, entry):
         """Load INI content to node editor with smart relationship detection"""
         try:
-            content = entry.data.decode('utf-8', errors='ignore')
-            
             # Parse current file
-            current_objects = self.parser.parse_ini_content(content, entry.path)
+            current_objects = self.parser.parse_entry(entry)
             
             # Update all_objects with current file objects
+            self._index_objects_by_file(current_objects)
             self.all_objects.update(current_objects)
             
-            # Rebuild relationships with updated objects
-            self.parser._build_relationships(self.all_objects)
+            # Only the objects from this file need their relationships redone
+            if self.parser.relationships:
+                self.parser._update_relationships(current_objects)
+            else:
+                self.parser._build_relationships(self.all_objects)
             
             # Clear canvas
-            self.node_canvas.delete("all")
-            self.node_canvas.nodes.clear()
-            self.node_canvas.connections.clear()
+            self.node_canvas.clear_graph()
             
             # Create general nodes first if showing overview
             generals_created = set()
             
+            # Nodes by name, filled as they are created and shared by the later passes
+            node_map = {}
+            
             # Create nodes for current file objects
             x_offset = 100
             y_offset = 100
             x_spacing = 250
             y_spacing = 200
-            col = 0
-            row = 0
+            columns = 4
             
             # First pass: Create all nodes
-            for obj_name, obj_data in current_objects.items():
+            for index, (obj_name, obj_data) in enumerate(current_objects.items()):
                 # Determine node type
                 node_type = self._get_node_type(obj_data)
                 
@@ -546,29 +836,27 @@ class EnhancedNodeEditorIntegration:
                     gen_node = self.node_canvas.create_enhanced_node(
                         NodeType.GENERAL, general, (50, 50 + len(generals_created) * 150)
                     )
+                    node_map[general] = gen_node
                     generals_created.add(general)
                     
                 # Create object node
+                row, col = divmod(index, columns)
                 x = x_offset + (col * x_spacing)
                 y = y_offset + (row * y_spacing)
                 
                 node = self.node_canvas.create_enhanced_node(node_type, obj_name, (x, y))
+                node_map[obj_name] = node
                 
-                # Set properties and quick stats
-                node.properties = obj_data.get('properties', {})
+                # Set properties and quick stats; copied so edits don't reach the parse cache
+                node.properties = dict(obj_data.properties)
                 self._update_node_quick_stats(node, obj_data)
-                
-                # Update position
-                col += 1
-                if col >= 4:
-                    col = 0
-                    row += 1
                     
             # Second pass: Create related nodes from other files if needed
-            self._create_related_nodes(current_objects)
+            self._create_related_nodes(current_objects, node_map)
                     
             # Third pass: Create all connections
-            self._create_smart_connections(current_objects)
+            with self._deferred_redraw():
+                self._create_smart_connections(current_objects, node_map)
             
             # Auto-layout if many nodes
             if len(self.node_canvas.nodes) > 10:
@@ -581,287 +869,258 @@ class EnhancedNodeEditorIntegration:
             import traceback
             traceback.print_exc()
             
-    def _create_related_nodes(self, current_objects):
+    def _create_related_nodes(self, current_objects, node_map):
         """Create nodes for related objects from other files"""
-        node_map = {node.name: node for node in self.node_canvas.nodes.values()}
+        relationships = self.parser.relationships
+        unit_weapons = relationships['unit_weapons']
+        unit_armor = relationships['unit_armor']
+        unit_locomotor = relationships['unit_locomotor']
         
         # Check what related objects we need to create
         needed_objects = set()
         
         for obj_name in current_objects:
             # Get weapons used by this object
-            weapons = self.parser.relationships['unit_weapons'].get(obj_name, [])
-            for weapon_name in weapons:
+            for weapon_name in unit_weapons.get(obj_name, ()):
                 if weapon_name not in node_map and weapon_name in self.all_objects:
                     needed_objects.add(weapon_name)
                     
             # Get armor used
-            armor = self.parser.relationships['unit_armor'].get(obj_name)
+            armor = unit_armor.get(obj_name)
             if armor and armor not in node_map and armor in self.all_objects:
                 needed_objects.add(armor)
                 
             # Get locomotor used
-            locomotor = self.parser.relationships['unit_locomotor'].get(obj_name)
+            locomotor = unit_locomotor.get(obj_name)
             if locomotor and locomotor not in node_map and locomotor in self.all_objects:
                 needed_objects.add(locomotor)
                 
         # Create nodes for needed objects
+        weapon_units = relationships['weapon_units']
         for obj_name in needed_objects:
             obj_data = self.all_objects[obj_name]
             node_type = self._get_node_type(obj_data)
             
-            # Find a good position near related units
-            related_positions = []
-            
-            # Find units using this object
-            if obj_name in self.parser.relationships['weapon_units']:
-                for unit_name in self.parser.relationships['weapon_units'][obj_name]:
-                    if unit_name in node_map:
-                        related_positions.append(node_map[unit_name].position)
+            # Find a good position near the units using this object
+            sum_x = sum_y = count = 0
+            for unit_name in weapon_units.get(obj_name, ()):
+                unit_node = node_map.get(unit_name)
+                if unit_node is not None:
+                    x, y = unit_node.position
+                    sum_x += x
+                    sum_y += y
+                    count += 1
                         
             # Calculate average position
-            if related_positions:
-                avg_x = sum(pos[0] for pos in related_positions) / len(related_positions)
-                avg_y = sum(pos[1] for pos in related_positions) / len(related_positions)
+            if count:
                 # Offset to the right
-                position = (avg_x + 250, avg_y)
+                position = (sum_x / count + 250, sum_y / count)
             else:
                 # Default position
                 position = (500, 100 + len(needed_objects) * 150)
                 
             # Create the node
             node = self.node_canvas.create_enhanced_node(node_type, obj_name, position)
-            node.properties = obj_data.get('properties', {})
+            node.properties = dict(obj_data.properties)
             self._update_node_quick_stats(node, obj_data)
+            node_map[obj_name] = node
             
-    def _create_smart_connections(self, current_objects):
+    def _create_smart_connections(self, current_objects, node_map):
         """Create connections including cross-file relationships"""
-        # Get node mapping
-        node_map = {node.name: node for node in self.node_canvas.nodes.values()}
+        object_links = self.parser.object_links
+        get_node = node_map.get
+        create_connection = self._create_typed_connection
         
-        # Create connections for all visible nodes
+        # Create connections for all visible nodes; the links cover the whole
+        # archive, so walking the canvas keeps this bound by what is shown
         for node in self.node_canvas.nodes.values():
-            obj_name = node.name
-            
+            links = object_links.get(node.name)
+            if links is None:
+                continue
+                
             # Weapon connections
-            if obj_name in self.parser.relationships['unit_weapons']:
-                weapons = self.parser.relationships['unit_weapons'][obj_name]
-                for weapon_name in weapons:
-                    if weapon_name in node_map:
-                        weapon_node = node_map[weapon_name]
-                        self._create_typed_connection(node, weapon_node, ConnectionType.WEAPON_SLOT)
-                        
-            # Armor connections
-            if obj_name in self.parser.relationships['unit_armor']:
-                armor_name = self.parser.relationships['unit_armor'][obj_name]
-                if armor_name in node_map:
-                    armor_node = node_map[armor_name]
-                    self._create_typed_connection(node, armor_node, ConnectionType.ARMOR_SET)
+            for weapon_name in links.weapons:
+                weapon_node = get_node(weapon_name)
+                if weapon_node is not None:
+                    create_connection(node, weapon_node, ConnectionType.WEAPON_SLOT)
                     
+            # Armor connections
+            armor_node = get_node(links.armor)
+            if armor_node is not None:
+                create_connection(node, armor_node, ConnectionType.ARMOR_SET)
+                
             # Locomotor connections
-            if obj_name in self.parser.relationships['unit_locomotor']:
-                loco_name = self.parser.relationships['unit_locomotor'][obj_name]
-                if loco_name in node_map:
-                    loco_node = node_map[loco_name]
-                    self._create_typed_connection(node, loco_node, ConnectionType.LOCOMOTOR_SET)
-                    
+            loco_node = get_node(links.locomotor)
+            if loco_node is not None:
+                create_connection(node, loco_node, ConnectionType.LOCOMOTOR_SET)
+                
             # General connections
-            if obj_name in self.parser.relationships['unit_general']:
-                general_name = self.parser.relationships['unit_general'][obj_name]
-                if general_name in node_map:
-                    gen_node = node_map[general_name]
-                    self._create_typed_connection(gen_node, node, ConnectionType.OWNS)
-                    
+            gen_node = get_node(links.general)
+            if gen_node is not None:
+                create_connection(gen_node, node, ConnectionType.OWNS)
+                
             # Prerequisite connections
-            if obj_name in self.parser.relationships['prerequisites']:
-                prereqs = self.parser.relationships['prerequisites'][obj_name]
-                for prereq_name in prereqs:
-                    if prereq_name in node_map:
-                        prereq_node = node_map[prereq_name]
-                        self._create_typed_connection(prereq_node, node, ConnectionType.PREREQUISITE)
-                        
-    def _update_node_quick_stats(self, node: EnhancedNode, obj_data: Dict = None):
+            for prereq_name in links.prerequisites:
+                prereq_node = get_node(prereq_name)
+                if prereq_node is not None:
+                    create_connection(prereq_node, node, ConnectionType.PREREQUISITE)
+                    
+    def _update_node_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject = None):
         """Update quick stats shown on node"""
+        handler = self.quick_stat_handlers.get(node.node_type)
+        if handler is None:
+            return
+            
         if not obj_data and node.name in self.all_objects:
             obj_data = self.all_objects[node.name]
             
-        if node.node_type == NodeType.UNIT:
-            node.quick_stats = {
-                'Cost': f"${node.properties.get('BuildCost', '?')}",
-                'Build': f"{node.properties.get('BuildTime', '?')}s",
-            }
-            
-            # Add health if available
-            for section in obj_data.get('sections', {}).values():
-                if section.get('type') == 'Body':
-                    health = section.get('properties', {}).get('MaxHealth')
-                    if health:
-                        node.quick_stats['Health'] = health
-                        
-        elif node.node_type == NodeType.WEAPON:
-            damage = node.properties.get('PrimaryDamage', '?')
-            range_val = node.properties.get('AttackRange', '?')
-            damage_type = node.properties.get('DamageType', '?')
-            
-            node.quick_stats = {
-                'Damage': damage,
-                'Range': range_val,
-                'Type': damage_type,
-            }
-            
-            # Add fire rate if available
-            delay = node.properties.get('DelayBetweenShots')
-            if delay:
-                try:
-                    rof = 60000 / float(delay)  # Convert to rounds per minute
-                    node.quick_stats['RPM'] = f"{rof:.0f}"
-                except:
-                    pass
+        handler(node, obj_data)
+        
+    def _unit_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject):
+        """Cost, build time and health of a unit"""
+        properties = node.properties
+        node.quick_stats = {
+            'Cost': f"${properties.get('BuildCost', '?')}",
+            'Build': f"{properties.get('BuildTime', '?')}s",
+        }
+        
+        # Add health if available
+        for section in obj_data.sections_by_type.get('Body', ()):
+            health = section.properties.get('MaxHealth')
+            if health:
+                node.quick_stats['Health'] = health
                     
-        elif node.node_type == NodeType.LOCOMOTOR:
-            node.quick_stats = {
-                'Speed': node.properties.get('Speed', '?'),
-                'Surfaces': node.properties.get('Surfaces', '?'),
-            }
-            
-        elif node.node_type == NodeType.ARMOR:
-            # Show key armor values
+    def _weapon_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject):
+        """Damage, range, type and rate of fire of a weapon"""
+        properties = node.properties
+        node.quick_stats = {
+            'Damage': properties.get('PrimaryDamage', '?'),
+            'Range': properties.get('AttackRange', '?'),
+            'Type': properties.get('DamageType', '?'),
+        }
+        
+        # Add fire rate if available, reparsing only when the delay changed
+        delay = properties.get('DelayBetweenShots')
+        if delay:
+            if delay != node._rpm_delay:
+                node._rpm_delay = delay
+                node._rpm = _rounds_per_minute(delay)
+            if node._rpm is not None:
+                node.quick_stats['RPM'] = node._rpm
+                
+    def _locomotor_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject):
+        """Speed and surfaces of a locomotor"""
+        properties = node.properties
+        node.quick_stats = {
+            'Speed': properties.get('Speed', '?'),
+            'Surfaces': properties.get('Surfaces', '?'),
+        }
+        
+    def _armor_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject):
+        """First few armor values of an armor"""
+        # Show first few armor values, rescanning only after an armor edit
+        if node._armor_stats is None:
             armor_values = []
             for key, value in node.properties.items():
-                if key.startswith('Armor') and '=' in str(value):
-                    armor_values.append(f"{key}: {value}")
-                    
-            if armor_values:
-                # Show first few armor values
-                for i, armor in enumerate(armor_values[:3]):
-                    node.quick_stats[f'Armor{i+1}'] = armor
-                    
-        elif node.node_type == NodeType.GENERAL:
-            # Count units and buildings
-            units = self.parser.relationships['general_units'].get(node.name, [])
-            node.quick_stats = {
-                'Units': str(len(units)),
-                'Faction': node.name,
-            }
-            
+                if key.startswith('Armor'):
+                    text = value if isinstance(value, str) else str(value)
+                    if '=' in text:
+                        armor_values.append(f"{key}: {text}")
+                        if len(armor_values) == 3:
+                            break
+            node._armor_stats = armor_values
+            
+        for i, armor in enumerate(node._armor_stats):
+            node.quick_stats[f'Armor{i+1}'] = armor
+            
+    def _general_quick_stats(self, node: EnhancedNode, obj_data: ParsedObject):
+        """Unit count of a general"""
+        # Count units and buildings
+        units = self.parser.relationships['general_units'].get(node.name, ())
+        node.quick_stats = {
+            'Units': str(len(units)),
+            'Faction': node.name,
+        }
+        
     def _create_typed_connection(self, from_node: EnhancedNode, to_node: EnhancedNode, 
                                conn_type: ConnectionType):
         """Create a properly typed connection between nodes"""
-        # Find appropriate ports
-        from_port = None
-        to_port = None
-        
-        # Find output port on from_node that matches the connection type
-        for port in from_node.output_ports:
-            if port.data_type == conn_type:
-                from_port = port
-                break
-                
-        # Find input port on to_node that matches the connection type
-        for port in to_node.input_ports:
-            if port.data_type == conn_type:
-                to_port = port
-                break
-                
+        # Find ports on both nodes that match the connection type
+        from_port = from_node.output_ports_by_type.get(conn_type)
+        to_port = to_node.input_ports_by_type.get(conn_type)
+        
         # Create ports if they don't exist
         if not from_port:
             # Create output port
-            from enhanced_node_editor import EnhancedPort
-            import uuid
-            
-            port_name = {
-                ConnectionType.WEAPON_SLOT: "Weapon",
-                ConnectionType.ARMOR_SET: "Armor", 
-                ConnectionType.LOCOMOTOR_SET: "Locomotor",
-                ConnectionType.OWNS: "Owns",
-                ConnectionType.PREREQUISITE: "Enables",
-            }.get(conn_type, str(conn_type.value))
+            port_name = OUTPUT_PORT_NAMES.get(conn_type, str(conn_type.value))
             
             from_port = EnhancedPort(
-                id=str(uuid.uuid4()),
+                id=uuid4().hex,
                 name=port_name,
                 port_type="output",
                 data_type=conn_type,
-                color=self._get_connection_color(conn_type)
+                color=CONNECTION_COLORS.get(conn_type, DEFAULT_CONNECTION_COLOR)
             )
-            from_node.output_ports.append(from_port)
+            from_node.add_ports([from_port])
             self.node_canvas._update_port_positions(from_node)
             
         if not to_port:
             # Create input port
-            from enhanced_node_editor import EnhancedPort
-            import uuid
-            
-            port_name = {
-                ConnectionType.WEAPON_SLOT: "Used By",
-                ConnectionType.ARMOR_SET: "Used By",
-                ConnectionType.LOCOMOTOR_SET: "Used By", 
-                ConnectionType.OWNS: "Owned By",
-                ConnectionType.PREREQUISITE: "Requires",
-            }.get(conn_type, str(conn_type.value))
+            port_name = INPUT_PORT_NAMES.get(conn_type, str(conn_type.value))
             
             to_port = EnhancedPort(
-                id=str(uuid.uuid4()),
+                id=uuid4().hex,
                 name=port_name,
                 port_type="input",
                 data_type=conn_type,
-                color=self._get_connection_color(conn_type)
+                color=CONNECTION_COLORS.get(conn_type, DEFAULT_CONNECTION_COLOR)
             )
-            to_node.input_ports.append(to_port)
+            to_node.add_ports([to_port])
             self.node_canvas._update_port_positions(to_node)
             
         if from_port and to_port:
             # Check if connection already exists
-            for conn in self.node_canvas.connections.values():
-                if (conn.from_node_id == from_node.id and 
-                    conn.to_node_id == to_node.id and
-                    conn.connection_type == conn_type):
-                    return  # Connection already exists
-                    
+            if self.node_canvas.find_connection(from_node.id, to_node.id, conn_type):
+                return
+                
             # Create the actual connection
             self.node_canvas._create_connection(from_node, from_port, to_node, to_port)
             
             # Redraw nodes to show new ports
-            self.node_canvas.redraw_node(from_node)
-            self.node_canvas.redraw_node(to_node)
-            
-    def _get_connection_color(self, conn_type: ConnectionType) -> str:
-        """Get color for connection type"""
-        colors = {
-            ConnectionType.WEAPON_SLOT: "#E74C3C",
-            ConnectionType.ARMOR_SET: "#F39C12",
-            ConnectionType.LOCOMOTOR_SET: "#27AE60",
-            ConnectionType.PREREQUISITE: "#9B59B6",
-            ConnectionType.UPGRADE_GRANTS: "#1ABC9C",
-            ConnectionType.CONFLICTS_WITH: "#C0392B",
-            ConnectionType.OWNS: "#3498DB",
-        }
-        return colors.get(conn_type, "#AAAAAA")
-        
-    def _get_node_type(self, obj_data: Dict) -> NodeType:
+            if self._dirty_nodes is not None:
+                self._dirty_nodes[from_node.id] = from_node
+                self._dirty_nodes[to_node.id] = to_node
+            else:
+                self.node_canvas.redraw_node(from_node)
+                self.node_canvas.redraw_node(to_node)
+                
+    @contextmanager
+    def _deferred_redraw(self):
+        """Redraw nodes touched by _create_typed_connection once, when the block ends"""
+        if self._dirty_nodes is not None:
+            # Already collecting for an outer block
+            yield
+            return
+            
+        self._dirty_nodes = {}
+        try:
+            yield
+        finally:
+            dirty_nodes, self._dirty_nodes = self._dirty_nodes, None
+            for node in dirty_nodes.values():
+                self.node_canvas.redraw_node(node)
+                
+    def _get_node_type(self, obj_data: ParsedObject) -> NodeType:
         """Determine node type from object data"""
-        obj_type = obj_data.get('type', '').lower()
-        
-        type_mapping = {
-            'weapon': NodeType.WEAPON,
-            'armor': NodeType.ARMOR,
-            'science': NodeType.SCIENCE,
-            'upgrade': NodeType.UPGRADE,
-            'locomotor': NodeType.LOCOMOTOR,
-            'commandset': NodeType.COMMANDSET,
-            'commandbutton': NodeType.COMMANDBUTTON,
-            'fxlist': NodeType.FXLIST,
-            'particlesystem': NodeType.PARTICLESYSTEM,
-            'objectcreationlist': NodeType.OCL,
-            'specialpower': NodeType.SPECIALPOWER,
-        }
+        obj_type = obj_data.type.lower()
         
-        if obj_type in type_mapping:
-            return type_mapping[obj_type]
+        node_type = OBJECT_NODE_TYPES.get(obj_type)
+        if node_type is not None:
+            return node_type
             
         # For Object type, check KindOf
         if obj_type == 'object':
-            kindof = str(obj_data.get('properties', {}).get('KindOf', '')).upper()
+            kindof = str(obj_data.properties.get('KindOf', '')).upper()
             if 'STRUCTURE' in kindof:
                 return NodeType.BUILDING
             elif 'PROJECTILE' in kindof:
@@ -890,20 +1149,17 @@ class EnhancedNodeEditorIntegration:
             
         # Hide nodes not from current file
         current_file = self.big_editor.current_entry.path
+        current_names = self._objs_by_file.get(current_file, frozenset())
         
         for node in self.node_canvas.nodes.values():
-            if node.name in self.all_objects:
-                obj_data = self.all_objects[node.name]
-                if obj_data.get('source_file') != current_file:
-                    # Hide node (implementation would set visibility)
-                    pass
+            if node.name not in current_names and node.name in self.all_objects:
+                # Hide node (implementation would set visibility)
+                pass
                     
     def show_general_overview(self):
         """Show overview grouped by generals"""
         # Clear and recreate with general grouping
-        self.node_canvas.delete("all")
-        self.node_canvas.nodes.clear()
-        self.node_canvas.connections.clear()
+        self.node_canvas.clear_graph()
         
         # Create general nodes
         generals = ['America', 'China', 'GLA', 'AirforceGeneral', 'LaserGeneral', 
@@ -917,26 +1173,27 @@ class EnhancedNodeEditorIntegration:
                 )
                 general_nodes[general] = node
                 
-        # Add units to each general
-        for general, units in self.parser.relationships['general_units'].items():
-            if general in general_nodes:
-                gen_node = general_nodes[general]
-                
-                # Create unit nodes around general
-                for j, unit_name in enumerate(units[:5]):  # Limit to 5 for display
-                    if unit_name in self.all_objects:
-                        unit_data = self.all_objects[unit_name]
-                        angle = (j / 5) * 2 * 3.14159
-                        x = gen_node.position[0] + 150 * math.cos(angle)
-                        y = gen_node.position[1] + 150 * math.sin(angle) + 50
-                        
-                        unit_node = self.node_canvas.create_enhanced_node(
-                            self._get_node_type(unit_data), unit_name, (x, y)
-                        )
-                        
-                        # Create connection
-                        self._create_typed_connection(gen_node, unit_node, ConnectionType.OWNS)
-                        
+        # Add units to each general, redrawing each hub node once at the end
+        with self._deferred_redraw():
+            for general, units in self.parser.relationships['general_units'].items():
+                if general in general_nodes:
+                    gen_node = general_nodes[general]
+                    
+                    # Create unit nodes around general
+                    gx, gy = gen_node.position
+                    for (cx, cy), unit_name in zip(_UNIT_CIRCLE, units):  # zip stops after 5 units
+                        if unit_name in self.all_objects:
+                            unit_data = self.all_objects[unit_name]
+                            x = gx + 150 * cx
+                            y = gy + 150 * cy + 50
+                            
+                            unit_node = self.node_canvas.create_enhanced_node(
+                                self._get_node_type(unit_data), unit_name, (x, y)
+                            )
+                            
+                            # Create connection
+                            self._create_typed_connection(gen_node, unit_node, ConnectionType.OWNS)
+                            
     def smart_add_to_general(self):
         """Smart operation to add selected unit to a general"""
         if not self.node_canvas.selected_nodes:
@@ -995,40 +1252,45 @@ class EnhancedNodeEditorIntegration:
     def auto_layout(self):
         """Enhanced auto-layout with grouping"""
         # Group nodes by type
-        groups = {}
+        groups = defaultdict(list)
         for node in self.node_canvas.nodes.values():
-            if node.category not in groups:
-                groups[node.category] = []
             groups[node.category].append(node)
             
-        # Layout each group
+        # Layout each group, then redraw the canvas once
         x_offset = 50
         for category, nodes in groups.items():
-            self._layout_group(nodes, x_offset, 50)
+            self._layout_group(nodes, x_offset, 50, redraw=False)
             x_offset += 400
+        self._redraw_canvas()
             
-    def _layout_group(self, nodes: List[EnhancedNode], start_x: int, start_y: int):
+    def _layout_group(self, nodes: List[EnhancedNode], start_x: int, start_y: int,
+                      redraw: bool = True):
         """Layout a group of nodes"""
         cols = 3
         spacing_x = 250
         spacing_y = 180
         
         for i, node in enumerate(nodes):
-            col = i % cols
-            row = i // cols
-            
+            row, col = divmod(i, cols)
             node.position = (start_x + col * spacing_x, start_y + row * spacing_y)
             
-        # Redraw all nodes
-        self.node_canvas.delete("all")
-        self.node_canvas.draw_grid()
+        if redraw:
+            self._redraw_canvas()
+            
+    def _redraw_canvas(self):
+        """Clear the canvas and draw every node and connection again"""
+        canvas = self.node_canvas
+        canvas.delete("all")
+        canvas.draw_grid()
         
-        for node in self.node_canvas.nodes.values():
-            self.node_canvas.draw_enhanced_node(node)
+        draw_node = canvas.draw_enhanced_node
+        for node in canvas.nodes.values():
+            draw_node(node)
             
         # Redraw connections
-        for conn in self.node_canvas.connections.values():
-            self.node_canvas.draw_connection(conn)
+        draw_connection = canvas.draw_connection
+        for conn in canvas.connections.values():
+            draw_connection(conn)
             
     def group_by_type(self):
         """Group nodes by their type"""
@@ -1036,38 +1298,36 @@ class EnhancedNodeEditorIntegration:
         
     def group_by_general(self):
         """Group nodes by their general/faction"""
-        # Group nodes by general
-        groups = {'Unknown': []}
+        # Group nodes by general, with Unknown still laid out first
+        groups = defaultdict(list, Unknown=[])
+        general_of = self.parser.relationships['unit_general'].get
         
         for node in self.node_canvas.nodes.values():
-            general = self.parser.relationships['unit_general'].get(node.name, 'Unknown')
-            if general not in groups:
-                groups[general] = []
-            groups[general].append(node)
+            groups[general_of(node.name, 'Unknown')].append(node)
             
-        # Layout each group
+        # Layout each group, then redraw the canvas once
         x_offset = 50
         for general, nodes in groups.items():
             if nodes:
-                self._layout_group(nodes, x_offset, 50)
+                self._layout_group(nodes, x_offset, 50, redraw=False)
                 x_offset += 400
+        self._redraw_canvas()
                 
     def _on_search_changed(self, *args):
-        """Handle search text change"""
+        """Handle search text change, filtering once typing pauses"""
+        if self._search_after_id is not None:
+            self.node_canvas.after_cancel(self._search_after_id)
+        self._search_after_id = self.node_canvas.after(100, self._apply_search_filter)
+        
+    def _apply_search_filter(self):
+        """Filter nodes by the current search text"""
+        self._search_after_id = None
         search_term = self.search_var.get().lower()
         
-        if not search_term:
-            # Show all nodes
-            for node in self.node_canvas.nodes.values():
-                # Set visibility (implementation would handle this)
-                pass
-        else:
-            # Filter nodes
-            for node in self.node_canvas.nodes.values():
-                visible = (search_term in node.name.lower() or 
-                          search_term in node.node_type.value.lower())
-                # Set visibility based on match
-                
+        # Hide nodes whose name and type don't contain the search text; empty shows all
+        for node in self.node_canvas.nodes.values():
+            self.node_canvas.set_node_hidden(node, search_term not in node._search_key)
+        
     def _on_selection_changed(self, event):
         """Handle node selection change"""
         if self.property_editor:
@@ -1079,6 +1339,16 @@ class EnhancedNodeEditorIntegration:
                     
             self.property_editor.set_nodes(selected)
 
+@dataclass(slots=True)
+class PropertyRow:
+    """Pooled editor row for one property, retargeted at whichever node is shown"""
+    frame: Any
+    prop_name: str
+    kind: str  # readonly, choice, boolean, number or text
+    value_widget: Any
+    var: Any = None  # None for read-only rows
+    node: Optional[EnhancedNode] = None
+    
 class PropertyEditor(ttk.Frame):
     """Enhanced property editor with validation and smart operations"""
     
@@ -1088,6 +1358,12 @@ class PropertyEditor(ttk.Frame):
         self.current_nodes = []
         self.property_widgets = {}
         
+        # Single-node widgets kept across refreshes instead of rebuilt
+        self._info_frame = None
+        self._info_labels = None
+        self._category_frames = {}  # category -> LabelFrame
+        self._row_pool = {}  # prop_name -> PropertyRow
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -1124,9 +1400,14 @@ class PropertyEditor(ttk.Frame):
         
     def refresh_properties(self):
         """Refresh property display"""
-        # Clear existing widgets
+        # Hide pooled widgets for reuse and destroy everything else
+        pooled = set(self._category_frames.values())
+        pooled.add(self._info_frame)
         for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+            if widget in pooled:
+                widget.pack_forget()
+            else:
+                widget.destroy()
         self.property_widgets.clear()
         
         if not self.current_nodes:
@@ -1146,11 +1427,16 @@ class PropertyEditor(ttk.Frame):
         node = self.current_nodes[0]
         
         # Node info
-        info_frame = ttk.LabelFrame(self.scrollable_frame, text="Node Info")
-        info_frame.pack(fill=tk.X, padx=5, pady=5)
+        if self._info_frame is None:
+            self._info_frame = ttk.LabelFrame(self.scrollable_frame, text="Node Info")
+            self._info_labels = (ttk.Label(self._info_frame), ttk.Label(self._info_frame))
+            for label in self._info_labels:
+                label.pack(anchor=tk.W, padx=5)
+        self._info_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Label(info_frame, text=f"Name: {node.name}").pack(anchor=tk.W, padx=5)
-        ttk.Label(info_frame, text=f"Type: {node.node_type.value}").pack(anchor=tk.W, padx=5)
+        name_label, type_label = self._info_labels
+        name_label.configure(text=f"Name: {node.name}")
+        type_label.configure(text=f"Type: {node.node_type.value}")
         
         # Properties by category
         categories = {}
@@ -1165,9 +1451,16 @@ class PropertyEditor(ttk.Frame):
                 categories[category] = []
             categories[category].append((prop_name, prop_value, metadata))
             
+        # Hide every pooled row; the ones this node needs are packed again in order
+        for row in self._row_pool.values():
+            row.frame.pack_forget()
+            
         # Create category frames
         for category, props in categories.items():
-            cat_frame = ttk.LabelFrame(self.scrollable_frame, text=category)
+            cat_frame = self._category_frames.get(category)
+            if cat_frame is None:
+                cat_frame = ttk.LabelFrame(self.scrollable_frame, text=category)
+                self._category_frames[category] = cat_frame
             cat_frame.pack(fill=tk.X, padx=5, pady=5)
             
             for prop_name, prop_value, metadata in props:
@@ -1175,9 +1468,28 @@ class PropertyEditor(ttk.Frame):
                                            prop_value, metadata)
                                            
     def _create_property_widget(self, parent, node, prop_name, prop_value, metadata):
+        """Show the pooled row for a property, building it on first use"""
+        row = self._row_pool.get(prop_name)
+        if row is None:
+            row = self._build_property_row(parent, prop_name, metadata)
+            self._row_pool[prop_name] = row
+            
+        # Point the row at this node and load its value
+        row.node = node
+        if row.kind == "readonly":
+            row.value_widget.configure(text=str(prop_value))
+        elif row.kind == "boolean":
+            row.var.set(prop_value.lower() in ['yes', 'true', '1'])
+        else:
+            row.var.set(str(prop_value))
+            
+        row.frame.pack(fill=tk.X, padx=5, pady=2)
+        if row.var is not None:
+            self.property_widgets[prop_name] = row.var
+            
+    def _build_property_row(self, parent, prop_name, metadata) -> PropertyRow:
         """Create appropriate widget for a property"""
         frame = ttk.Frame(parent)
-        frame.pack(fill=tk.X, padx=5, pady=2)
         
         # Label
         label_text = metadata.display_name if metadata else prop_name
@@ -1186,75 +1498,69 @@ class PropertyEditor(ttk.Frame):
             
         ttk.Label(frame, text=label_text, width=20).pack(side=tk.LEFT)
         
-        # Value widget
+        # Value widget; editable widgets carry their row as _prop_ctx for
+        # the shared commit handlers, so the row can be reused
         if metadata and metadata.read_only:
             # Read-only
-            ttk.Label(frame, text=str(prop_value)).pack(side=tk.LEFT)
+            label = ttk.Label(frame)
+            label.pack(side=tk.LEFT)
+            row = PropertyRow(frame, prop_name, "readonly", label)
             
         elif metadata and metadata.property_type == "choice":
             # Dropdown
-            var = tk.StringVar(value=str(prop_value))
+            var = tk.StringVar()
             combo = ttk.Combobox(frame, textvariable=var, values=metadata.choices,
                                state="readonly", width=20)
             combo.pack(side=tk.LEFT)
-            combo.bind('<<ComboboxSelected>>', 
-                      lambda e: self._on_property_changed(node, prop_name, var.get()))
-            self.property_widgets[prop_name] = var
+            row = PropertyRow(frame, prop_name, "choice", combo, var)
+            combo._prop_ctx = row
+            combo.bind('<<ComboboxSelected>>', self._on_row_commit)
             
         elif metadata and metadata.property_type == "boolean":
             # Checkbox
-            var = tk.BooleanVar(value=prop_value.lower() in ['yes', 'true', '1'])
+            var = tk.BooleanVar()
             check = ttk.Checkbutton(frame, variable=var,
                                    command=lambda: self._on_property_changed(
-                                       node, prop_name, 'Yes' if var.get() else 'No'))
+                                       row.node, prop_name, 'Yes' if var.get() else 'No'))
             check.pack(side=tk.LEFT)
-            self.property_widgets[prop_name] = var
+            row = PropertyRow(frame, prop_name, "boolean", check, var)
             
         elif metadata and metadata.property_type == "number":
             # Spinbox with validation
-            var = tk.StringVar(value=str(prop_value))
-            
-            def validate(value):
-                if not value:
-                    return True
-                try:
-                    num = float(value)
-                    if metadata.min_value is not None and num < metadata.min_value:
-                        return False
-                    if metadata.max_value is not None and num > metadata.max_value:
-                        return False
-                    return True
-                except:
-                    return False
-                    
-            vcmd = (self.register(validate), '%P')
+            var = tk.StringVar()
+            vcmd = (self.register(metadata.validator), '%P')
             spin = ttk.Spinbox(frame, textvariable=var, width=20,
                               from_=metadata.min_value or 0,
                               to=metadata.max_value or 999999,
                               validate='key', validatecommand=vcmd)
             spin.pack(side=tk.LEFT)
-            spin.bind('<Return>', lambda e: self._on_property_changed(
-                node, prop_name, var.get()))
-            spin.bind('<FocusOut>', lambda e: self._on_property_changed(
-                node, prop_name, var.get()))
-            self.property_widgets[prop_name] = var
+            row = PropertyRow(frame, prop_name, "number", spin, var)
+            spin._prop_ctx = row
+            spin.bind('<Return>', self._on_row_commit)
+            spin.bind('<FocusOut>', self._on_row_commit)
             
         else:
             # Text entry
-            var = tk.StringVar(value=str(prop_value))
+            var = tk.StringVar()
             entry = ttk.Entry(frame, textvariable=var, width=20)
             entry.pack(side=tk.LEFT)
-            entry.bind('<Return>', lambda e: self._on_property_changed(
-                node, prop_name, var.get()))
-            entry.bind('<FocusOut>', lambda e: self._on_property_changed(
-                node, prop_name, var.get()))
-            self.property_widgets[prop_name] = var
+            row = PropertyRow(frame, prop_name, "text", entry, var)
+            entry._prop_ctx = row
+            entry.bind('<Return>', self._on_row_commit)
+            entry.bind('<FocusOut>', self._on_row_commit)
             
         # Description tooltip
         if metadata and metadata.description:
             # Would add tooltip on hover
             pass
             
+        return row
+        
+    def _on_row_commit(self, event):
+        """Commit the value of the property row owning event.widget"""
+        row = event.widget._prop_ctx
+        self._on_property_changed(row.node, row.prop_name, row.var.get())
+        
     def _show_multi_node_properties(self):
         """Show properties for multiple nodes"""
         # Show common properties
@@ -1276,19 +1582,16 @@ class PropertyEditor(ttk.Frame):
         if not self.current_nodes:
             return {}
             
-        # Start with first node's properties
-        common = set(self.current_nodes[0].properties.keys())
+        # Walk the smallest property dict and probe the others, no temporary sets
+        smallest = min(self.current_nodes, key=lambda node: len(node.properties)).properties
+        all_props = [node.properties for node in self.current_nodes]
         
-        # Find intersection
-        for node in self.current_nodes[1:]:
-            common &= set(node.properties.keys())
-            
-        # Get values for common properties
+        # Get values for common properties, in selection order
         result = {}
-        for prop in common:
-            values = [node.properties.get(prop) for node in self.current_nodes]
-            result[prop] = values
-            
+        for prop in smallest:
+            if all(prop in props for props in all_props):
+                result[prop] = [props[prop] for props in all_props]
+                
         return result
         
     def _create_multi_property_widget(self, parent, prop_name, values):
@@ -1298,28 +1601,35 @@ class PropertyEditor(ttk.Frame):
         
         ttk.Label(frame, text=prop_name, width=20).pack(side=tk.LEFT)
         
-        # Check if all values are the same
-        unique_values = set(str(v) for v in values)
+        # Check if all values are the same, stopping at the first mismatch
+        first = values[0]
+        all_same = all(v == first for v in values[1:])
         
-        if len(unique_values) == 1:
+        if all_same:
             # All same - show single value
             var = tk.StringVar(value=values[0])
             entry = ttk.Entry(frame, textvariable=var, width=20)
             entry.pack(side=tk.LEFT)
-            entry.bind('<Return>', lambda e: self._on_multi_property_changed(
-                prop_name, var.get()))
+            entry._prop_ctx = (prop_name, var)
+            entry.bind('<Return>', self._on_multi_entry_commit)
         else:
             # Different values - show "<multiple values>"
             var = tk.StringVar(value="<multiple values>")
             entry = ttk.Entry(frame, textvariable=var, width=20)
             entry.pack(side=tk.LEFT)
-            entry.bind('<Return>', lambda e: self._on_multi_property_changed(
-                prop_name, var.get()))
+            entry._prop_ctx = (prop_name, var)
+            entry.bind('<Return>', self._on_multi_entry_commit)
             
             # Tooltip showing all values
+            unique_values = set(str(v) for v in values)
             ttk.Label(frame, text=f"({len(unique_values)} different)",
                      foreground="gray").pack(side=tk.LEFT, padx=5)
                      
+    def _on_multi_entry_commit(self, event):
+        """Commit a common-property entry to every selected node"""
+        prop_name, var = event.widget._prop_ctx
+        self._on_multi_property_changed(prop_name, var.get())
+        
     def _on_property_changed(self, node, prop_name, new_value):
         """Handle single property change"""
         # Validate
@@ -1335,6 +1645,9 @@ class PropertyEditor(ttk.Frame):
         # Update property
         old_value = node.properties.get(prop_name)
         node.properties[prop_name] = new_value
+        self.integration.properties_version += 1
+        if prop_name.startswith('Armor'):
+            node._armor_stats = None
         
         # Update visual
         self.integration._update_node_quick_stats(node)
@@ -1382,21 +1695,13 @@ class PropertyEditor(ttk.Frame):
                           
     def _find_units_using_weapon(self, weapon_node):
         """Find and highlight units using this weapon"""
-
-        units = self.integration.parser.relationships['general_units'].get(weapon_node.name, [])
-
+        canvas = self.integration.node_canvas
+        units = self.integration.parser.relationships['weapon_units'].get(weapon_node.name, ())
+        
+        # Select units; only nodes entering or leaving the selection are redrawn
+        by_name = canvas.nodes_by_name
+        canvas.set_selection(by_name[unit_name].id for unit_name in units if unit_name in by_name)
         
-        # Select units
-        self.integration.node_canvas.selected_nodes.clear()
-        for unit_name in units:
-            for node in self.integration.node_canvas.nodes.values():
-                if node.name == unit_name:
-                    self.integration.node_canvas.selected_nodes.add(node.id)
-                    
-        # Redraw to show selection
-        for node in self.integration.node_canvas.nodes.values():
-            self.integration.node_canvas.redraw_node(node)
-            
         messagebox.showinfo("Units Found", 
                            f"Found {len(units)} units using {weapon_node.name}")
 
@@ -1412,6 +1717,17 @@ class SmartGeneralAssignDialog:
         self.dialog.title("Assign to General")
         self.dialog.geometry("600x400")
         
+        # Fill the window once the event loop is idle so it opens straight away
+        self.dialog.after_idle(self._build_body)
+        
+    def _build_body(self):
+        """Create the dialog widgets, unless it was closed before they were due"""
+        if not self.dialog.winfo_exists():
+            return
+            
+        units = self.units
+        relationships = self.relationships
+        
         # Current assignments
         ttk.Label(self.dialog, text="Current Assignments:",
                  font=("Arial", 10, "bold")).pack(pady=5)
@@ -1419,10 +1735,10 @@ class SmartGeneralAssignDialog:
         current_frame = ttk.Frame(self.dialog)
         current_frame.pack(fill=tk.X, padx=20, pady=5)
         
-        for unit in units:
-            current_general = relationships['unit_general'].get(unit.name, 'None')
-            ttk.Label(current_frame, 
-                     text=f"{unit.name}: {current_general}").pack(anchor=tk.W)
+        # One multi-line label rather than a label per unit
+        general_of = relationships['unit_general'].get
+        assignments = '\n'.join(f"{unit.name}: {general_of(unit.name, 'None')}" for unit in units)
+        ttk.Label(current_frame, text=assignments, justify=tk.LEFT).pack(anchor=tk.W)
                      
         # General selection
         ttk.Label(self.dialog, text="Assign to General:",
@@ -1430,14 +1746,11 @@ class SmartGeneralAssignDialog:
                  
         self.general_var = tk.StringVar()
         
-        generals = ['America', 'China', 'GLA', 'AirforceGeneral', 'LaserGeneral',
-                   'SuperweaponGeneral', 'InfantryGeneral', 'TankGeneral', 
-                   'DemoGeneral', 'ChemicalGeneral', 'StealthGeneral']
-                   
-        for general in generals:
-            ttk.Radiobutton(self.dialog, text=general, 
-                           variable=self.general_var,
-                           value=general).pack(anchor=tk.W, padx=40)
+        radiobutton = ttk.Radiobutton
+        for general in ASSIGNABLE_GENERALS:
+            radiobutton(self.dialog, text=general, 
+                        variable=self.general_var,
+                        value=general).pack(anchor=tk.W, padx=40)
                            
         # Options
         options_frame = ttk.LabelFrame(self.dialog, text="Options")
@@ -1486,6 +1799,16 @@ class CloneToFactionDialog:
         self.dialog.title("Clone to Faction")
         self.dialog.geometry("500x400")
         
+        # Fill the window once the event loop is idle so it opens straight away
+        self.dialog.after_idle(self._build_body)
+        
+    def _build_body(self):
+        """Create the dialog widgets, unless it was closed before they were due"""
+        if not self.dialog.winfo_exists():
+            return
+            
+        units = self.units
+        
         # Source info
         ttk.Label(self.dialog, text=f"Cloning {len(units)} unit(s)",
                  font=("Arial", 10, "bold")).pack(pady=10)
@@ -1494,12 +1817,12 @@ class CloneToFactionDialog:
         ttk.Label(self.dialog, text="Target Faction:").pack(pady=5)
         
         self.target_var = tk.StringVar()
-        factions = ['America', 'China', 'GLA']
         
-        for faction in factions:
-            ttk.Radiobutton(self.dialog, text=faction,
-                           variable=self.target_var,
-                           value=faction).pack(anchor=tk.W, padx=40)
+        radiobutton = ttk.Radiobutton
+        for faction in CLONE_FACTIONS:
+            radiobutton(self.dialog, text=faction,
+                        variable=self.target_var,
+                        value=faction).pack(anchor=tk.W, padx=40)
                            
         # Balance adjustments
         adjust_frame = ttk.LabelFrame(self.dialog, text="Balance Adjustments")
@@ -1507,7 +1830,7 @@ class CloneToFactionDialog:
         
         # Cost modifier
         ttk.Label(adjust_frame, text="Cost Modifier:").grid(row=0, column=0, sticky=tk.W)
-        self.cost_var = tk.StringVar(value="100")
+        self.cost_var = tk.IntVar(value=100)
         cost_spin = ttk.Spinbox(adjust_frame, textvariable=self.cost_var,
                                from_=50, to=200, width=10)
         cost_spin.grid(row=0, column=1, padx=5)
@@ -1515,7 +1838,7 @@ class CloneToFactionDialog:
         
         # Health modifier
         ttk.Label(adjust_frame, text="Health Modifier:").grid(row=1, column=0, sticky=tk.W)
-        self.health_var = tk.StringVar(value="100")
+        self.health_var = tk.IntVar(value=100)
         health_spin = ttk.Spinbox(adjust_frame, textvariable=self.health_var,
                                  from_=50, to=200, width=10)
         health_spin.grid(row=1, column=1, padx=5)
@@ -1523,7 +1846,7 @@ class CloneToFactionDialog:
         
         # Damage modifier
         ttk.Label(adjust_frame, text="Damage Modifier:").grid(row=2, column=0, sticky=tk.W)
-        self.damage_var = tk.StringVar(value="100")
+        self.damage_var = tk.IntVar(value=100)
         damage_spin = ttk.Spinbox(adjust_frame, textvariable=self.damage_var,
                                  from_=50, to=200, width=10)
         damage_spin.grid(row=2, column=1, padx=5)
@@ -1552,12 +1875,20 @@ class CloneToFactionDialog:
             messagebox.showwarning("No Target", "Please select a target faction")
             return
             
+        # Percentages come back as ints; anything else typed in fails the get
+        try:
+            cost, health, damage = (self.cost_var.get(), self.health_var.get(),
+                                    self.damage_var.get())
+        except tk.TclError:
+            messagebox.showwarning("Invalid Modifier", "Modifiers must be whole percentages")
+            return
+            
         self.result = {
             'units': self.units,
             'target': self.target_var.get(),
-            'cost_modifier': float(self.cost_var.get()) / 100,
-            'health_modifier': float(self.health_var.get()) / 100,
-            'damage_modifier': float(self.damage_var.get()) / 100,
+            'cost_modifier': cost / 100,
+            'health_modifier': health / 100,
+            'damage_modifier': damage / 100,
             'prefix': self.prefix_var.get()
         }
         
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser, simpledialog
-from typing import Dict, List, Tuple, Optional, Any, Set
+from typing import Dict, List, Tuple, Optional, Any, Set, Callable
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
@@ -76,6 +76,29 @@ class PropertyMetadata:
     category: str = "General"
     read_only: bool = False
     affects_balance: bool = False
+    # Keystroke check for number fields, built once from min/max
+    validator: Optional[Callable[[str], bool]] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.validator is None and self.property_type == "number":
+            self.validator = _make_number_validator(self.min_value, self.max_value)
+            
+def _make_number_validator(min_value: Optional[float], max_value: Optional[float]) -> Callable[[str], bool]:
+    """Build a check that accepts partial input, or a number within the bounds"""
+    def validate(value: str) -> bool:
+        if not value:
+            return True
+        try:
+            num = float(value)
+        except ValueError:
+            return False
+        if min_value is not None and num < min_value:
+            return False
+        if max_value is not None and num > max_value:
+            return False
+        return True
+        
+    return validate
 
 class PropertyRegistry:
     """Registry of known properties with metadata for validation"""
@@ -329,6 +352,8 @@ class EnhancedNodeCanvas(tk.Canvas):
         # Enhanced state
         self.nodes = {}
         self.connections = {}
+        self._conn_index = {}  # (from_node_id, to_node_id, connection_type) -> connection
+        self._nodes_by_name = None  # name -> node, rebuilt lazily after nodes change
         self.selected_nodes = set()
         self.generals = {}  # Track which general owns which units
         self.property_registry = PropertyRegistry()
@@ -352,6 +377,8 @@ class EnhancedNodeCanvas(tk.Canvas):
         self.connection_start = None
         self.temp_line = None
         self.hovered_node = None
+        self._offscreen_dirty = set()  # Node ids whose redraw waits until they are in view
+        self.hidden_nodes = set()  # Node ids filtered out of view, e.g. by search
         
         # Bind events
         self._setup_bindings()
@@ -448,6 +475,7 @@ class EnhancedNodeCanvas(tk.Canvas):
         self.bind("<Delete>", self.delete_selected)
         self.bind("<Control-a>", self.select_all)
         self.bind("<Control-d>", self.duplicate_selected)
+        self.bind("<Configure>", self._on_resize)
         
         # Hover effects
         self.bind("<Motion>", self.on_hover)
@@ -590,6 +618,10 @@ class EnhancedNodeCanvas(tk.Canvas):
         scale = 1.1 if event.delta > 0 else 0.9
         self.scale("all", event.x, event.y, scale, scale)
         
+        # Zooming out brings deferred nodes into view, and after scaling their
+        # positions no longer tell where they are shown, so draw them all now
+        self._flush_offscreen_redraws()
+        
     def on_hover(self, event):
         """Handle mouse hover"""
         # Find what we're hovering over
@@ -624,10 +656,7 @@ class EnhancedNodeCanvas(tk.Canvas):
         
     def select_all(self, event=None):
         """Select all nodes"""
-        for node_id, node in self.nodes.items():
-            self.selected_nodes.add(node_id)
-            node.selected = True
-            self.redraw_node(node)
+        self.set_selection(self.nodes)
             
     def duplicate_selected(self, event=None):
         """Duplicate selected nodes"""
@@ -647,10 +676,8 @@ class EnhancedNodeCanvas(tk.Canvas):
                 new_node.properties = node.properties.copy()
                 new_nodes[node_id] = new_node.id
                 
-        # Clear selection and select new nodes
-        self.clear_selection()
-        for new_id in new_nodes.values():
-            self.select_node(new_id, True)
+        # Select the new nodes in place of the originals
+        self.set_selection(new_nodes.values())
             
     def clear_selection(self, event=None):
         """Clear all selected nodes"""
@@ -667,7 +694,9 @@ class EnhancedNodeCanvas(tk.Canvas):
     def select_node(self, node_id: str, add_to_selection: bool = False):
         """Select a node"""
         if not add_to_selection:
-            self.clear_selection()
+            # Only nodes whose state changes are redrawn
+            self.set_selection((node_id,))
+            return
             
         self.selected_nodes.add(node_id)
         node = self.nodes.get(node_id)
@@ -678,6 +707,58 @@ class EnhancedNodeCanvas(tk.Canvas):
         # Fire selection changed event
         self.event_generate("<<SelectionChanged>>")
         
+    def set_selection(self, node_ids):
+        """Select exactly these nodes, redrawing only those whose state changes"""
+        new_ids = set(node_ids)
+        region = self._visible_region()
+        for node_id in self.selected_nodes ^ new_ids:
+            node = self.nodes.get(node_id)
+            if node:
+                node.selected = node_id in new_ids
+                self._redraw_if_visible(node, region)
+        self.selected_nodes.clear()
+        self.selected_nodes.update(new_ids)
+        
+        # Fire selection changed event
+        self.event_generate("<<SelectionChanged>>")
+        
+    def _visible_region(self) -> Tuple[float, float, float, float]:
+        """Canvas coordinates of the area currently shown"""
+        return (self.canvasx(0), self.canvasy(0),
+                self.canvasx(self.winfo_width()), self.canvasy(self.winfo_height()))
+                
+    def _redraw_if_visible(self, node: 'EnhancedNode', region):
+        """Redraw a node now if it overlaps region, otherwise once it comes into view"""
+        # Test the drawn items, which zooming scales away from node.position
+        bbox = self.bbox(f"node_{node.id}")
+        x0, y0, x1, y1 = region
+        if not bbox or (bbox[0] < x1 and bbox[2] > x0 and bbox[1] < y1 and bbox[3] > y0):
+            self._offscreen_dirty.discard(node.id)
+            self.redraw_node(node)
+        else:
+            self._offscreen_dirty.add(node.id)
+            
+    def _on_resize(self, event):
+        """Redraw deferred nodes that the resized view now shows"""
+        if not self._offscreen_dirty:
+            return
+            
+        region = self._visible_region()
+        for node_id in list(self._offscreen_dirty):
+            node = self.nodes.get(node_id)
+            if node:
+                self._redraw_if_visible(node, region)
+            else:
+                self._offscreen_dirty.discard(node_id)
+                
+    def _flush_offscreen_redraws(self):
+        """Redraw every node whose redraw was deferred, wherever it is"""
+        for node_id in self._offscreen_dirty:
+            node = self.nodes.get(node_id)
+            if node:
+                self.redraw_node(node)
+        self._offscreen_dirty.clear()
+        
     def redraw_node(self, node: 'EnhancedNode'):
         """Redraw a single node"""
         # Delete old node visuals
@@ -686,6 +767,18 @@ class EnhancedNodeCanvas(tk.Canvas):
         # Redraw
         self.draw_enhanced_node(node)
         
+    def set_node_hidden(self, node: 'EnhancedNode', hidden: bool):
+        """Hide or show all of a node's items"""
+        if hidden:
+            if node.id not in self.hidden_nodes:
+                self.hidden_nodes.add(node.id)
+                self.itemconfigure(f"node_{node.id}", state="hidden")
+                self.itemconfigure(f"shadow_{node.id}", state="hidden")
+        elif node.id in self.hidden_nodes:
+            self.hidden_nodes.discard(node.id)
+            # Redraw so hover-only items come back hidden rather than shown
+            self.redraw_node(node)
+            
     def delete_node(self, node_id: str):
         """Delete a node and its connections"""
         node = self.nodes.get(node_id)
@@ -707,6 +800,32 @@ class EnhancedNodeCanvas(tk.Canvas):
             
         # Remove from nodes dict
         del self.nodes[node_id]
+        self._nodes_by_name = None
+        self.hidden_nodes.discard(node_id)
+        
+    def clear_graph(self):
+        """Delete every node and connection along with their visuals"""
+        self.delete("all")
+        self.nodes.clear()
+        self._nodes_by_name = None
+        self._offscreen_dirty.clear()
+        self.hidden_nodes.clear()
+        self.connections.clear()
+        self._conn_index.clear()
+        
+    @property
+    def nodes_by_name(self) -> Dict[str, 'EnhancedNode']:
+        """First node with each name, built on demand"""
+        if self._nodes_by_name is None:
+            by_name = {}
+            for node in self.nodes.values():
+                by_name.setdefault(node.name, node)
+            self._nodes_by_name = by_name
+        return self._nodes_by_name
+        
+    def find_connection(self, from_node_id: str, to_node_id: str, conn_type: 'ConnectionType'):
+        """Return the connection of this type between two nodes, if any"""
+        return self._conn_index.get((from_node_id, to_node_id, conn_type))
         
     def delete_connection(self, conn_id: str):
         """Delete a connection"""
@@ -733,6 +852,14 @@ class EnhancedNodeCanvas(tk.Canvas):
         
         # Remove from connections dict
         del self.connections[conn_id]
+        key = (conn.from_node_id, conn.to_node_id, conn.connection_type)
+        if self._conn_index.get(key) is conn:
+            del self._conn_index[key]
+            # Another connection of the same type may still join these nodes
+            for other in self.connections.values():
+                if (other.from_node_id, other.to_node_id, other.connection_type) == key:
+                    self._conn_index[key] = other
+                    break
         
     def _get_port(self, node: 'EnhancedNode', port_id: str):
         """Get a port from a node"""
@@ -872,7 +999,6 @@ class EnhancedNodeCanvas(tk.Canvas):
         
     def _create_connection(self, from_node, from_port, to_node, to_port):
         """Create a connection between two ports"""
-        import uuid
         from dataclasses import dataclass
         
         @dataclass
@@ -884,7 +1010,7 @@ class EnhancedNodeCanvas(tk.Canvas):
             to_port_id: str
             connection_type: ConnectionType
             
-        conn_id = str(uuid.uuid4())
+        conn_id = uuid.uuid4().hex
         connection = Connection(
             id=conn_id,
             from_node_id=from_node.id,
@@ -895,6 +1021,8 @@ class EnhancedNodeCanvas(tk.Canvas):
         )
         
         self.connections[conn_id] = connection
+        self._conn_index.setdefault(
+            (from_node.id, to_node.id, connection.connection_type), connection)
         from_port.connected_to.append(conn_id)
         to_port.connected_to.append(conn_id)
         
@@ -969,21 +1097,18 @@ class EnhancedNodeCanvas(tk.Canvas):
             
     def _setup_enhanced_ports(self, node: 'EnhancedNode'):
         """Setup ports for a node based on its type"""
-        # Import at function level to avoid circular imports
-        import uuid
-        
         if node.node_type == NodeType.UNIT:
             # Input ports
-            node.input_ports.extend([
+            node.add_ports([
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Prerequisites",
                     port_type="input",
                     data_type=ConnectionType.PREREQUISITE,
                     color="#9B59B6"
                 ),
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="From General",
                     port_type="input",
                     data_type=ConnectionType.OWNS,
@@ -991,23 +1116,23 @@ class EnhancedNodeCanvas(tk.Canvas):
                 ),
             ])
             # Output ports
-            node.output_ports.extend([
+            node.add_ports([
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Weapon",
                     port_type="output",
                     data_type=ConnectionType.WEAPON_SLOT,
                     color="#E74C3C"
                 ),
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Armor",
                     port_type="output",
                     data_type=ConnectionType.ARMOR_SET,
                     color="#F39C12"
                 ),
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Locomotor",
                     port_type="output",
                     data_type=ConnectionType.LOCOMOTOR_SET,
@@ -1017,9 +1142,9 @@ class EnhancedNodeCanvas(tk.Canvas):
             
         elif node.node_type == NodeType.WEAPON:
             # Input ports
-            node.input_ports.extend([
+            node.add_ports([
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Used By",
                     port_type="input",
                     data_type=ConnectionType.WEAPON_SLOT,
@@ -1027,16 +1152,16 @@ class EnhancedNodeCanvas(tk.Canvas):
                 ),
             ])
             # Output ports
-            node.output_ports.extend([
+            node.add_ports([
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Projectile",
                     port_type="output",
                     data_type=ConnectionType.PROJECTILE_REF,
                     color="#FF6B6B"
                 ),
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Effects",
                     port_type="output",
                     data_type=ConnectionType.FX_REF,
@@ -1046,9 +1171,9 @@ class EnhancedNodeCanvas(tk.Canvas):
             
         elif node.node_type == NodeType.GENERAL:
             # Output ports only
-            node.output_ports.extend([
+            node.add_ports([
                 EnhancedPort(
-                    id=str(uuid.uuid4()),
+                    id=uuid.uuid4().hex,
                     name="Units",
                     port_type="output",
                     data_type=ConnectionType.OWNS,
@@ -1064,7 +1189,7 @@ class EnhancedNodeCanvas(tk.Canvas):
         template = self.node_templates.get(node_type, {})
         
         node = EnhancedNode(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             node_type=node_type,
             name=name,
             position=position,
@@ -1078,6 +1203,7 @@ class EnhancedNodeCanvas(tk.Canvas):
         self._setup_enhanced_ports(node)
         
         self.nodes[node.id] = node
+        self._nodes_by_name = None
         self.draw_enhanced_node(node)
         
         return node
@@ -1174,6 +1300,10 @@ class EnhancedNodeCanvas(tk.Canvas):
         # Quick action buttons (appear on hover)
         self._create_quick_actions(node)
         
+        if node.id in self.hidden_nodes:
+            self.itemconfigure(f"node_{node.id}", state="hidden")
+            self.itemconfigure(f"shadow_{node.id}", state="hidden")
+            
     def _draw_enhanced_ports(self, node: 'EnhancedNode'):
         """Draw enhanced ports with better visuals"""
         for port in node.input_ports + node.output_ports:
@@ -1462,7 +1592,7 @@ class EnhancedNodeCanvas(tk.Canvas):
         
         return f"#{r:02x}{g:02x}{b:02x}"
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedNode:
     """Enhanced node with additional metadata"""
     id: str
@@ -1479,8 +1609,31 @@ class EnhancedNode:
     selected: bool = False
     locked: bool = False  # Prevent editing critical properties
     quick_stats: Dict[str, str] = field(default_factory=dict)  # Stats shown on node
+    # First port of each connection type, kept in step by add_ports
+    input_ports_by_type: Dict[ConnectionType, 'EnhancedPort'] = field(default_factory=dict, repr=False)
+    output_ports_by_type: Dict[ConnectionType, 'EnhancedPort'] = field(default_factory=dict, repr=False)
+    # Lowercased name and type for search; refresh via __post_init__ after a rename
+    _search_key: str = field(init=False, default="", repr=False, compare=False)
+    # First three "Key: value" armor stats; None until computed or after an Armor* edit
+    _armor_stats: Optional[List[str]] = field(init=False, default=None, repr=False, compare=False)
+    # DelayBetweenShots value _rpm was computed from, so weapon stats parse it once
+    _rpm_delay: Any = field(init=False, default=None, repr=False, compare=False)
+    _rpm: Optional[str] = field(init=False, default=None, repr=False, compare=False)
     
-@dataclass 
+    def __post_init__(self):
+        self._search_key = self.name.lower() + '\x00' + self.node_type.value.lower()
+        
+    def add_ports(self, ports: List['EnhancedPort']):
+        """Attach ports to the input or output side by their port_type"""
+        for port in ports:
+            if port.port_type == "input":
+                self.input_ports.append(port)
+                self.input_ports_by_type.setdefault(port.data_type, port)
+            else:
+                self.output_ports.append(port)
+                self.output_ports_by_type.setdefault(port.data_type, port)
+                
+@dataclass(slots=True)
 class EnhancedPort:
     """Enhanced port with better visuals"""
     id: str